@@ -0,0 +1,274 @@
+"""Local stand-in for a JBL soundbar used by the benchmarks.
+
+Serves ``httpapi.asp`` over HTTPS and the UPnP control endpoints over plain
+HTTP, mimicking the responses the integration reads from a real device.
+Latency, jitter and the share of failed requests are configurable so slow or
+flaky devices can be simulated.
+"""
+import asyncio
+from collections import Counter
+import json
+import os
+import random
+import ssl
+import uuid
+from xml.sax.saxutils import escape, quoteattr
+
+import aiohttp
+from aiohttp import web
+
+CERT_DIR = os.path.join(os.path.dirname(__file__), "..", "custom_components", "jbl_integration")
+
+INFO_EX_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/"><s:Body><u:GetInfoExResponse xmlns:u="urn:schemas-upnp-org:service:AVTransport:1"><CurrentTransportState>{transport_state}</CurrentTransportState><CurrentTransportStatus>OK</CurrentTransportStatus><CurrentSpeed>1</CurrentSpeed><LoopMode>4</LoopMode><PlayMedium>{play_medium}</PlayMedium><TrackSource></TrackSource><TrackURI>{track}</TrackURI><TrackDuration>00:00:00</TrackDuration><TrackMetaData></TrackMetaData><RelTime>00:00:00</RelTime><AbsTime>00:00:00</AbsTime><CurrentVolume>{volume}</CurrentVolume><CurrentMute>{mute}</CurrentMute><CurrentChannel>0</CurrentChannel><SlaveFlag>0</SlaveFlag><MasterUUID></MasterUUID><SlaveList></SlaveList></u:GetInfoExResponse></s:Body></s:Envelope>"""
+
+CONTROL_DEVICE_INFO_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/"><s:Body><u:GetControlDeviceInfoResponse xmlns:u="urn:schemas-upnp-org:service:RenderingControl:1"><MultiType>0</MultiType><Router></Router><Ssid>JBL Bar 1000</Ssid><SlaveMask>0</SlaveMask><CurrentVolume>{volume}</CurrentVolume><CurrentMute>{mute}</CurrentMute><CurrentChannel>0</CurrentChannel><SlaveList></SlaveList><Status>{status}</Status></u:GetControlDeviceInfoResponse></s:Body></s:Envelope>"""
+
+VOLUME_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/"><s:Body><u:GetVolumeResponse xmlns:u="urn:schemas-upnp-org:service:RenderingControl:1"><CurrentVolume>{volume}</CurrentVolume></u:GetVolumeResponse></s:Body></s:Envelope>"""
+
+INVALID_ACTION_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/"><s:Body><s:Fault><faultcode>s:Client</faultcode><faultstring>UPnPError</faultstring><detail><UPnPError xmlns="urn:schemas-upnp-org:control-1-0"><errorCode>401</errorCode><errorDescription>Invalid Action</errorDescription></UPnPError></detail></s:Fault></s:Body></s:Envelope>"""
+
+SOAP_OK_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/"><s:Body><u:{action}Response xmlns:u="{service}"></u:{action}Response></s:Body></s:Envelope>"""
+
+EVENT_NAMESPACES = {
+    "rendertransport1": "urn:schemas-upnp-org:metadata-1-0/AVT/",
+    "rendercontrol1": "urn:schemas-upnp-org:metadata-1-0/RCS/",
+}
+
+NEW_FIRMWARE_VERSION = "25.40.31.80.00"
+OLD_FIRMWARE_VERSION = "24.15.21.80.00"
+
+
+class FakeSoundbar:
+    """In-memory soundbar state served over the device's HTTP interfaces."""
+
+    def __init__(self, host="127.0.0.1", http_port=0, upnp_port=0, latency=0.0, new_firmware=True, jitter=0.0, error_rate=0.0, seed=None, unsupported_actions=()):
+        self.host = host
+        self.http_port = http_port
+        self.upnp_port = upnp_port
+        # Every request waits latency plus a uniform random 0..jitter seconds;
+        # error_rate of them are answered with 503 instead.
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.new_firmware = new_firmware
+        # SOAP actions answered with UPnP error 401, like a model without them.
+        self.unsupported_actions = set(unsupported_actions)
+        self.request_count = 0
+        self.error_count = 0
+        # httpapi command or SOAP action -> requests received.
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self.state = {
+            "play_medium": "HDMI",
+            "transport_state": "PLAYING",
+            "track": "",
+            "volume": 30,
+            "mute": 0,
+            "night_mode": "off",
+            "smart_mode": "on",
+            "pure_voice": "0",
+            "active_eq_id": "0",
+            "gains": [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0] if new_firmware else [0.0, 0.0, 0.0],
+        }
+        self.subscriptions = {}
+        self._runners = []
+        self._notify_session = None
+
+    @property
+    def firmware(self):
+        return NEW_FIRMWARE_VERSION if self.new_firmware else OLD_FIRMWARE_VERSION
+
+    async def start(self):
+        """Start both listeners; zero ports are replaced by the bound ones."""
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(os.path.join(CERT_DIR, "Cert.pem"), os.path.join(CERT_DIR, "Key.pem"))
+
+        http_app = web.Application()
+        http_app.router.add_route("*", "/httpapi.asp", self._handle_httpapi)
+        self.http_port = await self._serve(http_app, self.http_port, ssl_context)
+
+        upnp_app = web.Application()
+        upnp_app.router.add_post("/upnp/control/{service}", self._handle_upnp)
+        upnp_app.router.add_route("*", "/upnp/event/{service}", self._handle_event_subscription)
+        self.upnp_port = await self._serve(upnp_app, self.upnp_port, None)
+
+    async def stop(self):
+        if self._notify_session is not None:
+            await self._notify_session.close()
+            self._notify_session = None
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners = []
+
+    async def _serve(self, app, port, ssl_context):
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, port, ssl_context=ssl_context)
+        await site.start()
+        self._runners.append(runner)
+        return runner.addresses[0][1]
+
+    async def _delay(self, name):
+        """Wait like the device would; True if this request should fail."""
+        self.request_count += 1
+        self.requests[name] += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.error_count += 1
+            return True
+        return False
+
+    async def _handle_httpapi(self, request):
+        if request.method == "POST":
+            form = (await request.text()).split("&payload=", 1)
+            command = form[0].removeprefix("command=")
+            if await self._delay(command):
+                return web.Response(status=503)
+            payload = json.loads(form[1]) if len(form) > 1 else {}
+            return web.json_response(self._apply(command, payload))
+        command = request.query.get("command", "")
+        if await self._delay(command):
+            return web.Response(status=503)
+        return web.json_response(self._read(command))
+
+    def _read(self, command):
+        state = self.state
+        if command == "getDeviceInfo":
+            return {"device_info": {
+                "name": "JBL Bar Fake",
+                "uuid": "fake-uuid-0001",
+                "wlan0_mac": "00:11:22:33:44:55",
+                "serial_number": "FAKE0001",
+                "firmware": self.firmware,
+                "apcli0": self.host,
+            }}
+        if command == "getEQList":
+            return {"active_eq_id": state["active_eq_id"], "eq_list": [
+                {"eq_id": "0", "eq_name": "Custom", "band": 7, "eq_payload": {
+                    "fs": [125.0, 250.0, 500.0, 1000.0, 2000.0, 4000.0, 8000.0], "gain": state["gains"]}},
+                {"eq_id": "1", "eq_name": "Movie", "band": 7, "eq_payload": {
+                    "fs": [125.0, 250.0, 500.0, 1000.0, 2000.0, 4000.0, 8000.0], "gain": [2.0, 1.0, 0.0, 0.0, 1.0, 2.0, 2.0]}},
+            ]}
+        if command == "getEQ":
+            return {"eq_setting": {"eq_id": "1", "eq_name": "Custom", "eq_status": "on", "eq_payload": {
+                "fs": [150.0, 1000.0, 6000.0], "gain": state["gains"]}}}
+        if command == "getPersonalListeningMode":
+            return {"status": state["night_mode"]}
+        if command == "getSmartMode":
+            return {"status": state["smart_mode"]}
+        if command == "getPureVoiceState":
+            return {"purevoice_state": state["pure_voice"]}
+        if command == "getRearSpeakerStatus":
+            return {"rears": [
+                {"channel": "left", "capicity": 80, "charging": False, "docked": False, "status": "online"},
+                {"channel": "right", "capicity": 75, "charging": False, "docked": False, "status": "online"},
+            ]}
+        return {"error": "unknown command"}
+
+    def _apply(self, command, payload):
+        state = self.state
+        if command == "sendAppController":
+            key = payload.get("key_pressed")
+            if key == "power":
+                state["play_medium"] = "UNKNOWN" if state["play_medium"] != "UNKNOWN" else "HDMI"
+                state["transport_state"] = "STOPPED" if state["play_medium"] == "UNKNOWN" else "PLAYING"
+                self._schedule_notify("rendertransport1", {"TransportState": state["transport_state"]})
+            elif key == "surround":
+                state["smart_mode"] = "off" if state["smart_mode"] == "on" else "on"
+        elif command == "setPersonalListeningMode":
+            state["night_mode"] = payload.get("status", state["night_mode"])
+        elif command == "setPureVoiceState":
+            state["pure_voice"] = payload.get("purevoice_state", state["pure_voice"])
+        elif command in ("setActiveEQ", "setEQ"):
+            state["active_eq_id"] = str(payload.get("active_eq_id", state["active_eq_id"]))
+            state["gains"] = payload.get("eq_payload", {}).get("gain", state["gains"])
+        return {"status": "ok"}
+
+    async def _handle_upnp(self, request):
+        body = await request.text()
+        action = request.headers.get("Soapaction", "").strip('"').rsplit("#", 1)[-1]
+        if await self._delay(action):
+            return web.Response(status=503)
+        state = self.state
+        if action in self.unsupported_actions:
+            return web.Response(status=500, text=INVALID_ACTION_RESPONSE, content_type="text/xml")
+        if action == "GetInfoEx":
+            return self._soap(INFO_EX_RESPONSE.format(
+                transport_state=state["transport_state"], play_medium=state["play_medium"],
+                track=state["track"], volume=state["volume"], mute=state["mute"]))
+        if action == "GetControlDeviceInfo":
+            status = json.dumps({"hm_product_name": "JBL Bar Fake", "hardware": "FAKE-HW"})
+            return self._soap(CONTROL_DEVICE_INFO_RESPONSE.format(
+                volume=state["volume"], mute=state["mute"],
+                status=status.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")))
+        if action == "GetVolume":
+            return self._soap(VOLUME_RESPONSE.format(volume=state["volume"]))
+        if action == "SetVolume":
+            start = body.find("<DesiredVolume>") + len("<DesiredVolume>")
+            state["volume"] = int(body[start:body.find("</DesiredVolume>")])
+            self._schedule_notify("rendercontrol1", {"Volume": state["volume"]})
+            return self._soap(SOAP_OK_RESPONSE.format(
+                action=action, service="urn:schemas-upnp-org:service:RenderingControl:1"))
+        return web.Response(status=500, text=INVALID_ACTION_RESPONSE, content_type="text/xml")
+
+    async def _handle_event_subscription(self, request):
+        service = request.match_info["service"]
+        sid = request.headers.get("SID")
+        if request.method == "UNSUBSCRIBE":
+            return web.Response(status=200 if self.subscriptions.pop(sid, None) else 412)
+        if request.method != "SUBSCRIBE" or service not in EVENT_NAMESPACES:
+            return web.Response(status=405)
+        timeout = request.headers.get("TIMEOUT", "Second-1800")
+        if sid is not None:
+            # Renewal of an existing subscription.
+            return web.Response(status=200 if sid in self.subscriptions else 412, headers={"SID": sid, "TIMEOUT": timeout})
+        callback = request.headers.get("CALLBACK", "").strip("<>")
+        sid = f"uuid:{uuid.uuid4()}"
+        self.subscriptions[sid] = (service, callback, [0])
+        if service == "rendercontrol1":
+            initial = {"Volume": self.state["volume"], "Mute": self.state["mute"]}
+        else:
+            initial = {"TransportState": self.state["transport_state"]}
+        self._schedule_notify(service, initial, delay=0.1)
+        return web.Response(status=200, headers={"SID": sid, "TIMEOUT": timeout})
+
+    def _schedule_notify(self, service, changes, delay=0.0):
+        if self.subscriptions:
+            # Like the real device, send events after the triggering response.
+            asyncio.get_running_loop().call_later(delay, lambda: asyncio.ensure_future(self.notify(service, changes)))
+
+    async def notify(self, service, changes):
+        """Send a LastChange event for service to every subscriber."""
+        values = "".join(
+            f'<{name} channel="Master" val={quoteattr(str(value))}/>' if service == "rendercontrol1"
+            else f"<{name} val={quoteattr(str(value))}/>"
+            for name, value in changes.items()
+        )
+        last_change = f'<Event xmlns="{EVENT_NAMESPACES[service]}"><InstanceID val="0">{values}</InstanceID></Event>'
+        body = (
+            '<?xml version="1.0"?><e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0">'
+            f"<e:property><LastChange>{escape(last_change)}</LastChange></e:property></e:propertyset>"
+        )
+        if self._notify_session is None:
+            self._notify_session = aiohttp.ClientSession()
+        for sid, (subscribed_service, callback, seq) in list(self.subscriptions.items()):
+            if subscribed_service != service:
+                continue
+            headers = {"NT": "upnp:event", "NTS": "upnp:propchange", "SID": sid, "SEQ": str(seq[0]), "Content-Type": 'text/xml; charset="utf-8"'}
+            seq[0] += 1
+            try:
+                async with self._notify_session.request("NOTIFY", callback, data=body, headers=headers):
+                    pass
+            except aiohttp.ClientError:
+                self.subscriptions.pop(sid, None)
+
+    @staticmethod
+    def _soap(text):
+        return web.Response(text=text, content_type="text/xml")
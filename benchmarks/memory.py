@@ -0,0 +1,105 @@
+"""Measure the memory held per coordinator with tracemalloc.
+
+N coordinators are set up and polled from a replayed trace, so only the
+coordinator's own allocations count (no sockets or HTTP sessions). Without
+``--trace`` a trace is first recorded from the fake soundbar. Run from the
+repository root::
+
+    python -m benchmarks.memory --devices 1 10 100 --cycles 5
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from custom_components.jbl_integration.traffic import ReplayTransport, TrafficRecorder, load_trace
+
+from .fake_soundbar import FakeSoundbar
+from .replay import run_cycles
+from .standalone import coordinator_for
+
+
+def deep_size(value, seen):
+    """Return the bytes of value and everything it references not in seen."""
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(key, seen) + deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in value)
+    elif hasattr(value, "__slots__"):
+        size += sum(deep_size(getattr(value, slot), seen) for slot in value.__slots__ if slot != "__weakref__" and hasattr(value, slot))
+    return size
+
+
+async def record_fake_trace(path, old_firmware):
+    device = FakeSoundbar(new_firmware=not old_firmware)
+    await device.start()
+    coordinator = coordinator_for(device.host, device.http_port, device.upnp_port)
+    loop = asyncio.get_running_loop()
+    coordinator._recorder = TrafficRecorder(path, lambda target, *targetArgs: loop.run_in_executor(None, target, *targetArgs))
+    try:
+        await run_cycles(coordinator, 3)
+    finally:
+        await coordinator.async_close()
+        await device.stop()
+
+
+async def measure(records, count, cycles, top):
+    transports = [ReplayTransport(records, speed=0) for _ in range(count)]
+    gc.collect()
+    baseline = tracemalloc.take_snapshot()
+    coordinators = []
+    for transport in transports:
+        coordinator = coordinator_for("replay.invalid")
+        coordinator.transport = transport
+        coordinators.append(coordinator)
+    await asyncio.gather(*(run_cycles(coordinator, cycles) for coordinator in coordinators))
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    # Leave out what the benchmark itself keeps, e.g. the cycle durations.
+    ownFiles = [tracemalloc.Filter(False, f"{os.path.dirname(__file__)}{os.sep}*")]
+    baseline, snapshot = baseline.filter_traces(ownFiles), snapshot.filter_traces(ownFiles)
+
+    held = sum(stat.size_diff for stat in snapshot.compare_to(baseline, "filename"))
+    seen = set()
+    state = sum(deep_size(coordinator.data, seen) for coordinator in coordinators)
+    print(f"{count:>7}  {held / count / 1024:12.1f}  {state / count / 1024:12.2f}")
+    if top:
+        for stat in snapshot.compare_to(baseline, "lineno")[:top]:
+            print(f"         {stat.size_diff / count:10.0f} B/device  {stat.traceback}")
+
+    for coordinator in coordinators:
+        await coordinator.async_close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--trace", help="trace captured with the capture traffic option")
+    parser.add_argument("--old-firmware", action="store_true", help="record the fake soundbar with old firmware")
+    parser.add_argument("--top", type=int, default=0, help="show the largest allocation sites")
+    args = parser.parse_args()
+
+    if args.trace:
+        records = load_trace(args.trace)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "fake.jsonl.gz")
+            await record_fake_trace(path, args.old_firmware)
+            records = load_trace(path)
+
+    tracemalloc.start()
+    print(f"{'devices':>7}  {'KiB/device':>12}  {'state KiB':>12}")
+    for count in args.devices:
+        await measure(records, count, args.cycles, args.top)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
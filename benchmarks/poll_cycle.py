@@ -0,0 +1,66 @@
+"""Compare serial and concurrent poll-cycle time against a fake soundbar.
+
+Run from the repository root::
+
+    python -m benchmarks.poll_cycle --latency 0.05 --cycles 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from custom_components.jbl_integration.coordinator import Coordinator
+
+from .fake_soundbar import FakeSoundbar
+
+
+async def measure(device, concurrency, cycles):
+    """Return the per-cycle durations for one concurrency setting."""
+    coordinator = Coordinator(device.host, 5, httpPort=device.http_port, upnpPort=device.upnp_port)
+    coordinator._newFirmware = device.new_firmware
+    coordinator.maxConcurrentRequests = concurrency
+    durations = []
+    try:
+        # Warm up the pooled connections so both modes start from the same state.
+        await coordinator._async_update_data()
+        for _ in range(cycles):
+            # Measure full cycles, not just the endpoints that happen to be due.
+            coordinator.invalidate(*coordinator.pollPlan)
+            start = time.perf_counter()
+            await coordinator._async_update_data()
+            durations.append(time.perf_counter() - start)
+    finally:
+        await coordinator.async_close()
+    return durations
+
+
+def report(label, durations):
+    print(
+        f"{label:<12} mean {statistics.mean(durations) * 1000:8.1f} ms"
+        f"  min {min(durations) * 1000:8.1f} ms  max {max(durations) * 1000:8.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated device latency per request in seconds")
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--old-firmware", action="store_true")
+    args = parser.parse_args()
+
+    device = FakeSoundbar(latency=args.latency, new_firmware=not args.old_firmware)
+    await device.start()
+    try:
+        serial = await measure(device, 1, args.cycles)
+        concurrent = await measure(device, args.concurrency, args.cycles)
+    finally:
+        await device.stop()
+
+    report("serial", serial)
+    report(f"concurrent/{args.concurrency}", concurrent)
+    print(f"speed-up     {statistics.mean(serial) / statistics.mean(concurrent):8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Replay captured soundbar traffic through the coordinator.
+
+Traces come from the integration's "capture traffic" option (written to
+``<config>/jbl_integration/traces``) or can be recorded from the fake
+soundbar. Run from the repository root::
+
+    python -m benchmarks.replay record /tmp/fake.jsonl.gz --cycles 20
+    python -m benchmarks.replay replay /tmp/fake.jsonl.gz --speed 10 --cycles 50
+
+``--speed`` divides the captured device latency; 0 replays without any, so
+only the coordinator's own parsing and scheduling cost is measured.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.jbl_integration.traffic import ReplayTransport, TrafficRecorder, load_trace
+
+from .fake_soundbar import FakeSoundbar
+from .standalone import coordinator_for
+
+
+async def run_cycles(coordinator, cycles):
+    """Set up the coordinator, then return the durations of full poll cycles."""
+    await coordinator._SetupDeviceInfo()
+    durations = []
+    for _ in range(cycles):
+        # Measure full cycles, not just the endpoints that happen to be due.
+        coordinator.invalidate(*coordinator.pollPlan)
+        start = time.perf_counter()
+        try:
+            await coordinator._async_update_data()
+        except UpdateFailed:
+            continue
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+async def record(args):
+    device = FakeSoundbar(latency=args.latency, jitter=args.jitter, new_firmware=not args.old_firmware)
+    await device.start()
+    coordinator = coordinator_for(device.host, device.http_port, device.upnp_port)
+    loop = asyncio.get_running_loop()
+    coordinator._recorder = TrafficRecorder(args.trace, lambda target, *targetArgs: loop.run_in_executor(None, target, *targetArgs))
+    try:
+        await run_cycles(coordinator, args.cycles)
+    finally:
+        await coordinator.async_close()
+        await device.stop()
+    print(f"recorded {len(load_trace(args.trace))} requests to {args.trace}")
+
+
+async def replay(args):
+    records = load_trace(args.trace)
+    coordinator = coordinator_for("replay.invalid")
+    coordinator.transport = ReplayTransport(records, speed=args.speed)
+    try:
+        durations = await run_cycles(coordinator, args.cycles)
+    finally:
+        await coordinator.async_close()
+    print(f"replayed {len(records)} captured requests, new firmware: {coordinator.newFirmware}")
+    if durations:
+        print(
+            f"cycle        mean {statistics.mean(durations) * 1000:8.2f} ms"
+            f"  min {min(durations) * 1000:8.2f} ms  max {max(durations) * 1000:8.2f} ms"
+        )
+    print(f"failed cycles {args.cycles - len(durations)}, unmatched requests {coordinator.transport.misses}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    recordParser = commands.add_parser("record", help="capture a trace from the fake soundbar")
+    recordParser.add_argument("trace")
+    recordParser.add_argument("--cycles", type=int, default=20)
+    recordParser.add_argument("--latency", type=float, default=0.02)
+    recordParser.add_argument("--jitter", type=float, default=0.01)
+    recordParser.add_argument("--old-firmware", action="store_true")
+    replayParser = commands.add_parser("replay", help="poll a captured trace")
+    replayParser.add_argument("trace")
+    replayParser.add_argument("--cycles", type=int, default=20)
+    replayParser.add_argument("--speed", type=float, default=1.0, help="latency divisor; 0 replays without latency")
+    args = parser.parse_args()
+    await (record(args) if args.command == "record" else replay(args))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""Micro-benchmark of the GetInfoEx SOAP decoder against the old approach.
+
+    python -m benchmarks.soap_parser --number 20000
+"""
+import argparse
+import timeit
+from xml.etree import ElementTree as ET
+
+from custom_components.jbl_integration.soap import parse_info_ex
+
+from .fake_soundbar import INFO_EX_RESPONSE
+
+NAMESPACES = {
+    "s": "http://schemas.xmlsoap.org/soap/envelope/",
+    "u": "urn:schemas-upnp-org:service:AVTransport:1",
+}
+
+
+def parse_info_ex_find(text):
+    """The previous decoder: full tree plus one descendant search per field."""
+    root = ET.fromstring(text)
+    return {
+        "play_medium": root.find(".//u:GetInfoExResponse/PlayMedium", NAMESPACES).text,
+        "volume_level": root.find(".//u:GetInfoExResponse/CurrentVolume", NAMESPACES).text,
+        "track": root.find(".//u:GetInfoExResponse/TrackURI", NAMESPACES).text,
+        "transport_state": root.find(".//u:GetInfoExResponse/CurrentTransportState", NAMESPACES).text,
+        "transport_status": root.find(".//u:GetInfoExResponse/CurrentTransportStatus", NAMESPACES).text,
+        "track_duration": root.find(".//u:GetInfoExResponse/TrackDuration", NAMESPACES).text,
+        "mute": root.find(".//u:GetInfoExResponse/CurrentMute", NAMESPACES).text,
+        "channel": root.find(".//u:GetInfoExResponse/CurrentChannel", NAMESPACES).text,
+        "slaves": root.find(".//u:GetInfoExResponse/SlaveFlag", NAMESPACES).text,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    text = INFO_EX_RESPONSE.format(
+        transport_state="PLAYING", play_medium="HDMI", track="http://192.168.1.2/stream", volume=30, mute=0
+    )
+    assert parse_info_ex(text) == parse_info_ex_find(text)
+
+    for label, decoder in (("find", parse_info_ex_find), ("single-pass", parse_info_ex)):
+        best = min(timeit.repeat(lambda: decoder(text), number=args.number, repeat=5))
+        print(f"{label:<12} {best / args.number * 1e6:8.2f} us per response")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Coordinators that run without Home Assistant, for benchmarks and tests."""
+import types
+
+from custom_components.jbl_integration.coordinator import Coordinator
+
+
+def coordinator_for(host, httpPort=443, upnpPort=59152, entryId="standalone", options=None):
+    """Return a coordinator for host with the given options and no hass.
+
+    Without hass the coordinator only needs the entry's ID and options; it
+    polls when its methods are awaited and never schedules anything itself.
+    """
+    entry = types.SimpleNamespace(entry_id=entryId, data=dict(options or {}))
+    return Coordinator(host, 5, entry=entry, httpPort=httpPort, upnpPort=upnpPort)
@@ -0,0 +1,172 @@
+"""End-to-end benchmarks of the coordinator against many fake soundbars.
+
+For each device count, every fake device gets its own loopback address
+(127.0.0.1, 127.0.0.2, ...) and the suite measures setup time, poll-cycle
+latency, requests per cycle and command round-trip (a write followed by the
+re-read of what it changed). Run from the repository root::
+
+    python -m benchmarks.suite --devices 1 10 100 --latency 0.02 --jitter 0.01
+
+``--json`` saves the results; ``--baseline`` compares against saved results
+and exits non-zero when a timing got slower than the tolerance allows or a
+cycle needs more requests than before. Binding 127.0.0.x beyond 127.0.0.1
+works out of the box on Linux; elsewhere use ``--same-host``.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .fake_soundbar import FakeSoundbar
+from .standalone import coordinator_for
+
+# Results compared against a baseline: timings may grow by the tolerance,
+# request counts not at all.
+TIMINGS = ("setup_p95_ms", "cycle_p50_ms", "cycle_p95_ms", "round_ms", "command_p95_ms")
+COUNTS = ("requests_per_cycle",)
+
+
+def percentile(values, q):
+    """Return the q-th percentile of values in milliseconds."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+
+
+async def timed(coro):
+    """Await coro and return its duration, or None if it failed."""
+    start = time.perf_counter()
+    try:
+        await coro
+    except UpdateFailed:
+        return None
+    return time.perf_counter() - start
+
+
+async def run(count, args):
+    """Benchmark count devices and return the measurements."""
+    devices = [
+        FakeSoundbar(
+            host="127.0.0.1" if args.same_host else f"127.0.0.{index + 1}",
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            new_firmware=not args.old_firmware,
+            seed=index,
+        )
+        for index in range(count)
+    ]
+    await asyncio.gather(*(device.start() for device in devices))
+    coordinators = [
+        coordinator_for(device.host, device.http_port, device.upnp_port, entryId=f"bench{index}")
+        for index, device in enumerate(devices)
+    ]
+    try:
+        start = time.perf_counter()
+        setup = await asyncio.gather(*(timed(coordinator._SetupDeviceInfo()) for coordinator in coordinators))
+        setupWall = time.perf_counter() - start
+
+        cycles, rounds = [], []
+        requestsBefore = sum(device.request_count for device in devices)
+        for _ in range(args.cycles):
+            # Measure full cycles, not just the endpoints that happen to be due.
+            for coordinator in coordinators:
+                coordinator.invalidate(*coordinator.pollPlan)
+            start = time.perf_counter()
+            cycles.extend(await asyncio.gather(*(timed(coordinator._async_update_data()) for coordinator in coordinators)))
+            rounds.append(time.perf_counter() - start)
+        requests = sum(device.request_count for device in devices) - requestsBefore
+
+        commands = []
+        for attempt in range(args.commands):
+            commands.extend(await asyncio.gather(*(
+                timed(command_round_trip(coordinator, attempt % 2 == 0)) for coordinator in coordinators
+            )))
+    finally:
+        await asyncio.gather(*(coordinator.async_close() for coordinator in coordinators))
+        await asyncio.gather(*(device.stop() for device in devices))
+
+    cycleTimes = [duration for duration in cycles if duration is not None]
+    return {
+        "devices": count,
+        "setup_wall_ms": round(setupWall * 1000, 1),
+        "setup_p95_ms": percentile([duration for duration in setup if duration is not None], 0.95),
+        "cycle_p50_ms": percentile(cycleTimes, 0.5),
+        "cycle_p95_ms": percentile(cycleTimes, 0.95),
+        "failed_cycles": len(cycles) - len(cycleTimes),
+        "round_ms": round(statistics.mean(rounds) * 1000, 1) if rounds else None,
+        "requests_per_cycle": round(requests / (count * args.cycles), 2) if args.cycles else None,
+        "command_p95_ms": percentile([duration for duration in commands if duration is not None], 0.95),
+        "device_errors": sum(device.error_count for device in devices),
+    }
+
+
+async def command_round_trip(coordinator, value):
+    """Switch night mode and re-read what the command changed."""
+    await coordinator.setNightMode(value)
+    await coordinator.async_refresh_stale()
+
+
+def compare(results, baseline, tolerance):
+    """Return the regressions of results against baseline."""
+    previous = {entry["devices"]: entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        old = previous.get(entry["devices"])
+        if old is None:
+            continue
+        for key in TIMINGS:
+            if entry[key] is not None and old.get(key) and entry[key] > old[key] * (1 + tolerance):
+                regressions.append(f"{entry['devices']} devices: {key} {old[key]} -> {entry[key]}")
+        for key in COUNTS:
+            if entry[key] is not None and old.get(key) is not None and entry[key] > old[key]:
+                regressions.append(f"{entry['devices']} devices: {key} {old[key]} -> {entry[key]}")
+    return regressions
+
+
+def report(results):
+    columns = ("devices",) + ("setup_wall_ms",) + TIMINGS + COUNTS + ("failed_cycles", "device_errors")
+    print("  ".join(f"{column:>18}" for column in columns))
+    for entry in results:
+        print("  ".join(f"{'-' if entry[column] is None else entry[column]:>18}" for column in columns))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated device latency per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="random extra latency per request, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests the devices answer with 503")
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--commands", type=int, default=5)
+    parser.add_argument("--old-firmware", action="store_true")
+    parser.add_argument("--same-host", action="store_true", help="serve every device on 127.0.0.1")
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="fail on regressions against results saved with --json")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slow-down against the baseline")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.devices:
+        results.append(await run(count, args))
+    report(results)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""Measure UPnP event delivery latency against a fake soundbar.
+
+Subscribes to the fake device's events, changes the volume through the
+coordinator and reports how long the change takes to reach the callback.
+
+    python -m benchmarks.upnp_events --samples 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from custom_components.jbl_integration.coordinator import Coordinator
+from custom_components.jbl_integration.upnp_events import UpnpEventSubscriber
+
+from .fake_soundbar import FakeSoundbar
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    device = FakeSoundbar()
+    await device.start()
+    coordinator = Coordinator(device.host, 5, httpPort=device.http_port, upnpPort=device.upnp_port)
+    subscribed = asyncio.Event()
+    received = asyncio.Queue()
+
+    subscriber = UpnpEventSubscriber(
+        await coordinator._async_get_session(),
+        coordinator.upnpEventUrl,
+        "127.0.0.1",
+        lambda updates: received.put_nowait((time.perf_counter(), updates)),
+        lambda ok: subscribed.set() if ok else None,
+    )
+    await subscriber.async_start()
+    latencies = []
+    try:
+        await asyncio.wait_for(subscribed.wait(), 10)
+        await asyncio.sleep(0.3)
+        while not received.empty():
+            received.get_nowait()
+        for sample in range(args.samples):
+            volume = 10 + sample % 50
+            start = time.perf_counter()
+            await coordinator.setVolume(volume)
+            while True:
+                stamp, updates = await asyncio.wait_for(received.get(), 5)
+                if updates.get("volume_level") == str(volume):
+                    latencies.append(stamp - start)
+                    break
+    finally:
+        await subscriber.async_stop()
+        await coordinator.async_close()
+        await device.stop()
+
+    print(f"events received {len(latencies)}")
+    print(f"set -> event    mean {statistics.mean(latencies) * 1000:.1f} ms  max {max(latencies) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,9 +5,11 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import DOMAIN, STORAGE_VERSION
 from .coordinator import Coordinator
+from .services import async_setup_services
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_UUID, CONF_ADDRESS, CONF_SCAN_INTERVAL
 
 # Define the configuration schema for your integration
@@ -16,6 +18,7 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the JBL integration."""
+    async_setup_services(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -24,14 +27,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     _LOGGER.debug("Setting up JBL Integration. Entry data: %s", str(entry.data))
     # Pass the IP address and polling rate to the Coordinator
     coordinator = Coordinator(entry.data.get(CONF_ADDRESS), entry.data.get(CONF_SCAN_INTERVAL),hass, entry)
-    await coordinator._SetupDeviceInfo()
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        # With a cached device, set up immediately and revalidate in the background.
+        fromCache = await coordinator.async_load_cache()
+        if not fromCache:
+            await coordinator._SetupDeviceInfo()
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await coordinator.async_close()
+        raise
+
+    if coordinator.upnpEvents:
+        try:
+            await coordinator.async_start_events()
+        except Exception as e:
+            _LOGGER.warning("Could not start UPnP event listener, using polling only: %s", str(e))
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {"coordinator": coordinator}
 
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "switch","number","button","binary_sensor","select"])
 
+    if fromCache:
+        entry.async_create_background_task(hass, coordinator.async_revalidate(), f"{DOMAIN}_revalidate_{entry.entry_id}")
+
 
     return True
 
@@ -59,6 +78,11 @@ async def async_migrate_entry(hass: HomeAssistant, entry: dict):
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached device data of a deleted entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     """Reload the config entry."""
     _LOGGER.debug("Reloading JBL Integration. Entry data: %s", str(config_entry.data))
@@ -76,5 +100,6 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     await hass.config_entries.async_forward_entry_unload(entry, "binary_sensor")
     await hass.config_entries.async_forward_entry_unload(entry, "select")
 
-    hass.data[DOMAIN].pop(entry.entry_id)
+    entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+    await entry_data["coordinator"].async_close()
     return True
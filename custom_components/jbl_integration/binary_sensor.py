@@ -1,192 +1,97 @@
 """Binary Sensor platform for JBL integration."""
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
-from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
 from .const import DOMAIN
-from .entity import build_entity_id
+from .coordinator import Coordinator
+from .entity import JBLEntity, build_entity_id, rear_device_info, rear_speaker
 
 _LOGGER = logging.getLogger(__name__)
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
-    """Set up the JBL binary sensor platform."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-
-    if "Rears" in coordinator.data:
-        async_add_entities([
-            JBLChargingSensor(coordinator, entry, 0),
-            JBLDockedSensor(coordinator, entry, 0),
-            JBLOnlineSensor(coordinator, entry, 0),
-            JBLChargingSensor(coordinator, entry, 1),
-            JBLDockedSensor(coordinator, entry, 1),
-            JBLOnlineSensor(coordinator, entry, 1),
-        ])
 
-class JBLChargingSensor(BinarySensorEntity):
-    """Representation of a charging sensor for the JBL rear speakers."""
-
-    def __init__(self, coordinator, entry, arrayNumber: int):
-        """Initialize the sensor."""
-        self.coordinator = coordinator
-        self.number = arrayNumber
-        self._entry = entry
-        self.entityName = "Charging"
-        self.entity_id = build_entity_id(
-            "binary_sensor",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            self.coordinator.data["Rears"][self.number]["channel"],
-            self.entityName,
-        )
+@dataclass(frozen=True, kw_only=True)
+class JBLRearBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a binary sensor of a rear speaker."""
 
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return self.entityName
+    is_on_fn: Callable[[dict], bool]
 
-    @property
-    def is_on(self):
-        """Return true if the sensor is on."""
-        return self.coordinator.data["Rears"][self.number]["charging"]
 
-    @property
-    def device_class(self):
-        return BinarySensorDeviceClass.BATTERY_CHARGING
+REAR_BINARY_SENSORS = (
+    JBLRearBinarySensorEntityDescription(
+        key="charging",
+        name="Charging",
+        device_class=BinarySensorDeviceClass.BATTERY_CHARGING,
+        is_on_fn=lambda rear: rear["charging"],
+    ),
+    JBLRearBinarySensorEntityDescription(
+        key="docked",
+        name="Docked",
+        device_class=BinarySensorDeviceClass.PLUG,
+        is_on_fn=lambda rear: rear["docked"],
+    ),
+    JBLRearBinarySensorEntityDescription(
+        key="online",
+        name="Online",
+        device_class=BinarySensorDeviceClass.CONNECTIVITY,
+        is_on_fn=lambda rear: rear["status"] == "online",
+    ),
+)
 
-    @property
-    def unique_id(self):
-        """Return a unique ID for the sensor."""
-        return f"jbl_{self._entry.entry_id}_{self.coordinator.data["Rears"][self.number]["channel"].lower()}_{self.entityName.replace(' ', '_').lower()}"
 
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Set up the JBL binary sensor platform."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        BaseDevice = self.coordinator.device_info.copy()
-        BaseDevice["name"] = f"{BaseDevice['name']} Rear Speaker {self.coordinator.data['Rears'][self.number]['channel'].title()}"
-        BaseDevice["identifiers"] = {(DOMAIN, f"{self.coordinator.device_info.get('name', 'jbl_integration').replace(' ', '_').lower()}_{self.coordinator.data['Rears'][self.number]['channel']}")}
-        return BaseDevice
+    async_add_entities([
+        JBLRearBinarySensor(coordinator, entry, number, rear["channel"], description)
+        for number, rear in enumerate((coordinator.data.get("Rears") or [])[:2])
+        for description in REAR_BINARY_SENSORS
+    ])
 
-    async def async_added_to_hass(self):
-        """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
 
-    async def async_update(self):
-        """Update the sensor."""
-        await self.coordinator.async_request_refresh()
+class JBLRearBinarySensor(JBLEntity, BinarySensorEntity):
+    """Representation of a binary sensor of one rear speaker of the JBL."""
 
-class JBLDockedSensor(BinarySensorEntity):
-    """Representation of a docked sensor for the JBL rear speakers."""
+    entity_description: JBLRearBinarySensorEntityDescription
 
-    def __init__(self, coordinator, entry, arrayNumber: int):
+    def __init__(self, coordinator: Coordinator, entry: ConfigEntry, number: int, channel: str, description: JBLRearBinarySensorEntityDescription):
         """Initialize the sensor."""
         self.coordinator = coordinator
-        self.number = arrayNumber
-        self._entry = entry
-        self.entityName = "Docked"
+        self.number = number
+        self.entity_description = description
+        self._attr_unique_id = f"jbl_{entry.entry_id}_{channel.lower()}_{description.name.replace(' ', '_').lower()}"
+        self._attr_device_info = rear_device_info(coordinator.device_info, channel)
         self.entity_id = build_entity_id(
             "binary_sensor",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            self.coordinator.data["Rears"][self.number]["channel"],
-            self.entityName,
+            coordinator.device_info.get("name", "jbl_integration"),
+            channel,
+            description.name,
         )
 
     @property
-    def name(self):
-        """Return the name of the sensor."""
-        return self.entityName
+    def available(self):
+        """Return False while the soundbar does not report this rear speaker."""
+        return super().available and rear_speaker(self.coordinator.data, self.number) is not None
 
     @property
     def is_on(self):
         """Return true if the sensor is on."""
-        return self.coordinator.data["Rears"][self.number]["docked"]
-
-    @property
-    def device_class(self):
-        return BinarySensorDeviceClass.PLUG
-
-    @property
-    def unique_id(self):
-        """Return a unique ID for the sensor."""
-        return f"jbl_{self._entry.entry_id}_{self.coordinator.data["Rears"][self.number]["channel"].lower()}_{self.entityName.replace(' ', '_').lower()}"
-
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        BaseDevice = self.coordinator.device_info.copy()
-        BaseDevice["name"] = f"{BaseDevice['name']} Rear Speaker {self.coordinator.data['Rears'][self.number]['channel'].title()}"
-        BaseDevice["identifiers"] = {(DOMAIN, f"{self.coordinator.device_info.get('name', 'jbl_integration').replace(' ', '_').lower()}_{self.coordinator.data['Rears'][self.number]['channel']}")}
-        return BaseDevice
+        rear = rear_speaker(self.coordinator.data, self.number)
+        return self.entity_description.is_on_fn(rear) if rear is not None else None
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+        self.async_on_remove(self.coordinator.async_add_key_listener(("Rears",), self.async_write_ha_state))
 
     async def async_update(self):
         """Update the sensor."""
         await self.coordinator.async_request_refresh()
-
-class JBLOnlineSensor(BinarySensorEntity):
-    """Representation of an online sensor for the JBL rear speakers."""
-
-    def __init__(self, coordinator, entry, arrayNumber: int):
-        """Initialize the sensor."""
-        self.coordinator = coordinator
-        self.number = arrayNumber
-        self._entry = entry
-        self.entityName = "Online"
-        self.entity_id = build_entity_id(
-            "binary_sensor",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            self.coordinator.data["Rears"][self.number]["channel"],
-            self.entityName,
-        )
-
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return self.entityName
-
-    @property
-    def is_on(self):
-        """Return true if the sensor is on."""
-        return self.coordinator.data["Rears"][self.number]["status"] == "online"
-
-    @property
-    def device_class(self):
-        return BinarySensorDeviceClass.CONNECTIVITY
-
-    @property
-    def unique_id(self):
-        """Return a unique ID for the sensor."""
-        return f"jbl_{self._entry.entry_id}_{self.coordinator.data["Rears"][self.number]["channel"].lower()}_{self.entityName.replace(' ', '_').lower()}"
-
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        BaseDevice = self.coordinator.device_info.copy()
-        BaseDevice["name"] = f"{BaseDevice['name']} Rear Speaker {self.coordinator.data['Rears'][self.number]['channel'].title()}"
-        BaseDevice["identifiers"] = {(DOMAIN, f"{self.coordinator.device_info.get('name', 'jbl_integration').replace(' ', '_').lower()}_{self.coordinator.data['Rears'][self.number]['channel']}")}
-        return BaseDevice
-
-    async def async_added_to_hass(self):
-        """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
-
-    async def async_update(self):
-        """Update the sensor."""
-        await self.coordinator.async_request_refresh()  
\ No newline at end of file
@@ -1,83 +1,57 @@
 """Button platform for JBL integration."""
-import async_timeout
 import logging
-from homeassistant.components.button import ButtonEntity
+from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
 from .coordinator import Coordinator
-from .entity import build_entity_id
+from .entity import JBLEntity, build_entity_id
 
 _LOGGER = logging.getLogger(__name__)
 
+# The description key is the sendAppController key the button presses.
+BUTTONS = (
+    ButtonEntityDescription(key="power", name="Power", icon="mdi:power", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="mute", name="Mute", icon="mdi:volume-off", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="volumeUp", name="Increase Volume", icon="mdi:volume-plus", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="volumeDown", name="Lower Volume", icon="mdi:volume-minus", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="musicPlayPause", name="Play/Pause", icon="mdi:play-pause", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="smart_triger", name="Moment", icon="mdi:heart-box", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="calibration", name="Calibration", icon="mdi:calculator-variant", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="keyRear", name="Rear", icon="mdi:numeric-2-box-multiple", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="bassboost", name="Bass", icon="mdi:equalizer", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="keyAtmosLevel", name="Atmos", icon="mdi:equalizer", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="source-hdmi-switch", name="HDMI", icon="mdi:video-input-hdmi", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="bluetooth", name="Bluetooth", icon="mdi:bluetooth", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="source-tv", name="TV", icon="mdi:television-box", entity_registry_enabled_default=False),
+    ButtonEntityDescription(key="surround", name="Smart Mode", icon="mdi:surround-sound", entity_registry_enabled_default=False),
+)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up the JBL button platform."""
-
-    
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
-    async_add_entities([
-        JBLButton(coordinator,entry,"power","Power","mdi:power"),
-        JBLButton(coordinator,entry,"mute","Mute","mdi:volume-off"),
-        JBLButton(coordinator,entry,"volumeUp","Increase Volume","mdi:volume-plus"),
-        JBLButton(coordinator,entry,"volumeDown","Lower Volume","mdi:volume-minus"),
-        JBLButton(coordinator,entry,"musicPlayPause","Play/Pause","mdi:play-pause"),
-        JBLButton(coordinator,entry,"smart_triger","Moment","mdi:heart-box"),
-        JBLButton(coordinator,entry,"calibration","Calibration","mdi:calculator-variant"),
-        JBLButton(coordinator,entry,"keyRear","Rear","mdi:numeric-2-box-multiple"),
-        JBLButton(coordinator,entry,"bassboost","Bass","mdi:equalizer"),
-        JBLButton(coordinator,entry,"keyAtmosLevel","Atmos","mdi:equalizer"),
-        JBLButton(coordinator,entry,"source-hdmi-switch","HDMI","mdi:video-input-hdmi"),
-        JBLButton(coordinator,entry,"bluetooth","Bluetooth","mdi:bluetooth"),
-        JBLButton(coordinator,entry,"source-tv","TV","mdi:television-box"),
-        JBLButton(coordinator,entry,"surround","Smart Mode","mdi:surround-sound"),
-    ])
+    async_add_entities([JBLButton(coordinator, entry, description) for description in BUTTONS])
 
-class JBLButton(ButtonEntity):
-    """Base class for a JBL button."""
 
-    def __init__(self, coordinator, entry, actionstring, name, icon):
-        """Initialize the sensor."""
-        self.coordinator:Coordinator = coordinator
-        self._entry = entry
-        self.entityName = name
-        self.entityicon = icon
-        self.actionstring = actionstring
+class JBLButton(JBLEntity, ButtonEntity):
+    """Button sending one remote-control key to the JBL."""
+
+    def __init__(self, coordinator: Coordinator, entry: ConfigEntry, description: ButtonEntityDescription):
+        """Initialize the button."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = f"jbl_800_Button{description.name.replace(' ', '')}_{entry.entry_id}"
+        self._attr_device_info = coordinator.device_info
         self.entity_id = build_entity_id(
             "button",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            self.entityName,
+            coordinator.device_info.get("name", "jbl_integration"),
+            description.name,
         )
-        
-
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return self.entityName
-
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        """Return whether the entity should be enabled when first added to the entity registry."""
-        return False  # Disable the sensor by default
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend."""
-        return self.entityicon
-
-    @property
-    def unique_id(self):
-        """Return a unique ID for the sensor."""
-        return f"jbl_800_Button{self.entityName.replace(' ', '')}_{self._entry.entry_id}"
-
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        return self.coordinator.device_info
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self.coordinator._send_command(self.actionstring)
-
-        
+        await self.coordinator._send_command(self.entity_description.key)
+        await self.coordinator.async_refresh_stale()
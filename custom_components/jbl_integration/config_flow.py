@@ -13,11 +13,49 @@ from homeassistant.const import __version__ as HAVERSION
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 from homeassistant.core import callback
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    CONF_MODE_INTERVAL,
+    DEFAULT_MODE_INTERVAL,
+    CONF_REARS_INTERVAL,
+    DEFAULT_REARS_INTERVAL,
+    CONF_EQ_PRESETS_INTERVAL,
+    DEFAULT_EQ_PRESETS_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    DEFAULT_ADAPTIVE_POLLING,
+    CONF_IDLE_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    CONF_UPNP_EVENTS,
+    DEFAULT_UPNP_EVENTS,
+    CONF_CONNECT_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    CONF_READ_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    CONF_READ_RETRIES,
+    DEFAULT_READ_RETRIES,
+    CONF_CYCLE_DEADLINE,
+    DEFAULT_CYCLE_DEADLINE,
+    CONF_CAPTURE_TRAFFIC,
+    DEFAULT_CAPTURE_TRAFFIC,
+    PROBE_CONNECT_TIMEOUT,
+    PROBE_READ_TIMEOUT,
+)
 from .coordinator import Coordinator
+from .request_policy import RequestPolicy
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def _probeCoordinator(hass, address, pollingRate):
+    """Return a coordinator that tries the device once, so an unreachable
+    address is reported within seconds instead of after every retry."""
+    coordinator = Coordinator(address, pollingRate, hass)
+    coordinator.requestPolicy = RequestPolicy(PROBE_CONNECT_TIMEOUT, PROBE_READ_TIMEOUT, retries=0)
+    return coordinator
+
+
 class JBLConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Config flow for JBL Integration."""
     VERSION = 2
@@ -46,13 +84,15 @@ class JBLConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors[CONF_SCAN_INTERVAL] = "invalid_polling_rate"
 
             if not errors:
-                coordinator = Coordinator(ip_address, polling_rate)
+                coordinator = _probeCoordinator(self.hass, ip_address, polling_rate)
                 try:
                     device_Type = await coordinator.getDeviceType()
                     if device_Type.get("hm_product_name", "unknown_product") == "unknown_product":
                         errors[CONF_SCAN_INTERVAL] = "could not reach device"
                 except Exception:
                     errors[CONF_SCAN_INTERVAL] = "could not reach device"
+                finally:
+                    await coordinator.async_close()
 
             # If no errors, create the entry
             if not errors:
@@ -181,13 +221,15 @@ class JBLConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors[CONF_SCAN_INTERVAL] = "invalid_polling_rate"
 
             if not errors:
-                coordinator = Coordinator(ip_address, polling_rate)
+                coordinator = _probeCoordinator(self.hass, ip_address, polling_rate)
                 try:
                     device_Type = await coordinator.getDeviceType()
                     if device_Type.get("hm_product_name", "unknown_product") == "unknown_product":
                         errors[CONF_ADDRESS] = "could not reach device"
                 except Exception:
                     errors[CONF_ADDRESS] = "could not reach device"
+                finally:
+                    await coordinator.async_close()
             
             if not errors:
                 device_info[CONF_ADDRESS] = ip_address
@@ -252,6 +294,18 @@ class OptionsFlowHandler(OptionsFlowWithReload):
         schema = {
             vol.Optional(CONF_ADDRESS, default=self.config_entry.data.get(CONF_ADDRESS, 5),): str,
             vol.Optional(CONF_SCAN_INTERVAL, default=self.config_entry.data.get(CONF_SCAN_INTERVAL, 5),): int,
+            vol.Optional(CONF_MAX_CONCURRENT_REQUESTS, default=self.config_entry.data.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),): vol.All(int, vol.Range(min=1, max=7)),
+            vol.Optional(CONF_MODE_INTERVAL, default=self.config_entry.data.get(CONF_MODE_INTERVAL, DEFAULT_MODE_INTERVAL),): vol.All(int, vol.Range(min=1, max=3600)),
+            vol.Optional(CONF_REARS_INTERVAL, default=self.config_entry.data.get(CONF_REARS_INTERVAL, DEFAULT_REARS_INTERVAL),): vol.All(int, vol.Range(min=1, max=86400)),
+            vol.Optional(CONF_EQ_PRESETS_INTERVAL, default=self.config_entry.data.get(CONF_EQ_PRESETS_INTERVAL, DEFAULT_EQ_PRESETS_INTERVAL),): vol.All(int, vol.Range(min=1, max=86400)),
+            vol.Optional(CONF_ADAPTIVE_POLLING, default=self.config_entry.data.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),): bool,
+            vol.Optional(CONF_IDLE_INTERVAL, default=self.config_entry.data.get(CONF_IDLE_INTERVAL, DEFAULT_IDLE_INTERVAL),): vol.All(int, vol.Range(min=1, max=3600)),
+            vol.Optional(CONF_UPNP_EVENTS, default=self.config_entry.data.get(CONF_UPNP_EVENTS, DEFAULT_UPNP_EVENTS),): bool,
+            vol.Optional(CONF_CONNECT_TIMEOUT, default=self.config_entry.data.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
+            vol.Optional(CONF_READ_TIMEOUT, default=self.config_entry.data.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=120)),
+            vol.Optional(CONF_READ_RETRIES, default=self.config_entry.data.get(CONF_READ_RETRIES, DEFAULT_READ_RETRIES),): vol.All(int, vol.Range(min=0, max=5)),
+            vol.Optional(CONF_CYCLE_DEADLINE, default=self.config_entry.data.get(CONF_CYCLE_DEADLINE, DEFAULT_CYCLE_DEADLINE),): vol.All(vol.Coerce(float), vol.Range(min=1, max=600)),
+            vol.Optional(CONF_CAPTURE_TRAFFIC, default=self.config_entry.data.get(CONF_CAPTURE_TRAFFIC, DEFAULT_CAPTURE_TRAFFIC),): bool,
         }
 
 
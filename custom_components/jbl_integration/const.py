@@ -1,2 +1,71 @@
 """Constants for the JBL integration."""
 DOMAIN = "jbl_integration"
+
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 3
+
+# Per-endpoint polling cadence in seconds; transport/volume follow the scan interval.
+CONF_MODE_INTERVAL = "mode_interval"
+DEFAULT_MODE_INTERVAL = 30
+CONF_REARS_INTERVAL = "rears_interval"
+DEFAULT_REARS_INTERVAL = 300
+CONF_EQ_PRESETS_INTERVAL = "eq_presets_interval"
+DEFAULT_EQ_PRESETS_INTERVAL = 3600
+
+# Activity-adaptive polling.
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = True
+CONF_IDLE_INTERVAL = "idle_interval"
+DEFAULT_IDLE_INTERVAL = 60
+BOOST_SCAN_INTERVAL = 2
+BOOST_WINDOW = 30
+# Seconds a soundbar must stay stopped or paused before it counts as idle.
+IDLE_GRACE_PERIOD = 300
+
+# Request policy: per-request timeouts in seconds, retries of idempotent
+# reads, and the longest a whole poll cycle may take.
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+DEFAULT_CONNECT_TIMEOUT = 5
+CONF_READ_TIMEOUT = "read_timeout"
+DEFAULT_READ_TIMEOUT = 10
+CONF_READ_RETRIES = "read_retries"
+DEFAULT_READ_RETRIES = 2
+CONF_CYCLE_DEADLINE = "cycle_deadline"
+DEFAULT_CYCLE_DEADLINE = 30
+RETRY_BACKOFF = 0.5
+# The config flow's reachability probe: one attempt with short timeouts.
+PROBE_CONNECT_TIMEOUT = 3
+PROBE_READ_TIMEOUT = 5
+
+CONF_UPNP_EVENTS = "upnp_events"
+DEFAULT_UPNP_EVENTS = False
+
+STORAGE_VERSION = 1
+CACHE_SAVE_DELAY = 60
+
+# Seconds a queued write waits for newer values before it is sent.
+COMMAND_SETTLE_TIME = 0.3
+
+# Coordinator data keys of the EQ bands per firmware generation.
+EQ_BANDS_NEW_FIRMWARE = ("125Hz", "250Hz", "500Hz", "1000Hz", "2000Hz", "4000Hz", "8000Hz")
+EQ_BANDS_OLD_FIRMWARE = ("EQ_1_Low", "EQ_2_Mid", "EQ_3_High")
+
+# Consecutive failed polls before a soundbar is treated as unreachable, and
+# the longest wait between recovery probes in seconds.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_MAX_BACKOFF = 300
+
+# Shared poll scheduler: requests in flight across all soundbars, and the
+# random spread around each device's poll slot as a fraction of the slot.
+MAX_GLOBAL_REQUESTS = 8
+SCHEDULE_JITTER = 0.1
+
+# Opt-in capture of device traffic for replay in benchmarks: requests
+# buffered before a write to disk, and requests captured per setup.
+CONF_CAPTURE_TRAFFIC = "capture_traffic"
+DEFAULT_CAPTURE_TRAFFIC = False
+TRACE_FLUSH_RECORDS = 50
+TRACE_MAX_RECORDS = 20000
+
+# Seconds between state updates of the request statistics sensors.
+STATS_UPDATE_INTERVAL = 60
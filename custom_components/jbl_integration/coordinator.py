@@ -1,36 +1,276 @@
 """Sensor platform for JBL integration."""
 import asyncio
+import contextlib
 import aiohttp
 import json
 import logging
 import urllib3
+import os
 import ssl
-import certifi
+import time
 from datetime import timedelta
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import callback
+from homeassistant.components.network import async_get_source_ip
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_UUID, CONF_ADDRESS, CONF_SCAN_INTERVAL
 from homeassistant.exceptions import ConfigEntryNotReady
-from .const import DOMAIN
+from homeassistant.util.json import json_loads
+from .const import (
+    DOMAIN,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    CONF_MODE_INTERVAL,
+    DEFAULT_MODE_INTERVAL,
+    CONF_REARS_INTERVAL,
+    DEFAULT_REARS_INTERVAL,
+    CONF_EQ_PRESETS_INTERVAL,
+    DEFAULT_EQ_PRESETS_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    DEFAULT_ADAPTIVE_POLLING,
+    CONF_IDLE_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    BOOST_SCAN_INTERVAL,
+    BOOST_WINDOW,
+    IDLE_GRACE_PERIOD,
+    CONF_UPNP_EVENTS,
+    DEFAULT_UPNP_EVENTS,
+    STORAGE_VERSION,
+    CACHE_SAVE_DELAY,
+    COMMAND_SETTLE_TIME,
+    EQ_BANDS_NEW_FIRMWARE,
+    EQ_BANDS_OLD_FIRMWARE,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_BACKOFF,
+    CONF_CAPTURE_TRAFFIC,
+    DEFAULT_CAPTURE_TRAFFIC,
+)
+from .scheduler import async_get_scheduler
+from .request_policy import RETRY_STATUSES, RequestPolicy
+from .stats import OUTCOME_FAILURE, OUTCOME_SUCCESS, OUTCOME_TIMEOUT, DeviceStats, requestName
+from .soap import has_element, is_unsupported_action, parse_control_device_info, parse_info_ex
+from .state import SoundbarState, intern_preset
+from .traffic import ERROR_CLIENT, ERROR_TIMEOUT, TrafficRecorder
+from .upnp_events import UpnpEventSubscriber
 
 _LOGGER = logging.getLogger(__name__)
 
+CERT_PATH = os.path.join(os.path.dirname(__file__), "Cert.pem")
+KEY_PATH = os.path.join(os.path.dirname(__file__), "Key.pem")
+
+_sslContext = None
+_sslContextLock = asyncio.Lock()
+
+
+def _createSslContext():
+    """Build the client SSL context with the JBL client certificate.
+
+    The soundbar presents a self-signed certificate, so verification is off and
+    no CA bundle needs to be read.
+    """
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+    ssl_context.load_cert_chain(certfile=CERT_PATH, keyfile=KEY_PATH)
+    return ssl_context
+
+
+async def async_get_ssl_context(hass=None):
+    """Return the process-wide client SSL context, building it in an executor once."""
+    global _sslContext
+    if _sslContext is None:
+        async with _sslContextLock:
+            if _sslContext is None:
+                if hass is not None:
+                    _sslContext = await hass.async_add_executor_job(_createSslContext)
+                else:
+                    _sslContext = await asyncio.get_running_loop().run_in_executor(None, _createSslContext)
+    return _sslContext
+
+# Optional poll-plan endpoints -> (httpapi.asp command, response key proving
+# support). The EQ entries depend on the firmware generation.
+PROBED_ENDPOINTS = {
+    "night_mode": ("getPersonalListeningMode", "status"),
+    "rears": ("getRearSpeakerStatus", "rears"),
+    "smart_mode": ("getSmartMode", "status"),
+    "pure_voice": ("getPureVoiceState", "purevoice_state"),
+}
+
+# Optional UPnP features -> (control service, service type, read action and
+# its arguments, response element proving support). GetInfoEx is not probed:
+# every poll cycle and the circuit breaker depend on it, so a soundbar
+# without it cannot be set up in the first place.
+PROBED_ACTIONS = {
+    "volume": (
+        "rendercontrol1",
+        "urn:schemas-upnp-org:service:RenderingControl:1",
+        "GetVolume",
+        "<InstanceID>0</InstanceID><Channel>Master</Channel>",
+        "CurrentVolume",
+    ),
+}
+
+# Transport fields whose change counts as user activity.
+ACTIVITY_KEYS = ("play_medium", "transport_state", "volume_level", "mute")
+# Transport states of a soundbar that is on but not playing.
+IDLE_TRANSPORT_STATES = ("STOPPED", "PAUSED_PLAYBACK", "NO_MEDIA_PRESENT")
+
+# Health states of the per-device circuit breaker. While open, the poll plan is
+# suspended and only a single transport info probe is sent per backoff period.
+HEALTH_CLOSED = "closed"
+HEALTH_OPEN = "open"
+HEALTH_HALF_OPEN = "half_open"
+
+# getDeviceInfo and GetControlDeviceInfo fields that identify the device and
+# firmware; other fields may change on their own without a reload.
+DEVICE_INFO_IDENTITY = ("uuid", "wlan0_mac", "name", "firmware")
+DEVICE_TYPE_IDENTITY = ("hm_product_name",)
+
+# Returned by a getter whose responses are byte-identical to its last read:
+# the data it produced then is still current.
+UNCHANGED = object()
+
+
+class _Response:
+    """An httpapi.asp response body, parsed at most once and only on demand."""
+
+    __slots__ = ("body", "digest", "_json")
+
+    def __init__(self, body):
+        self.body = body
+        self.digest = hash(body)
+        self._json = None
+
+    def json(self):
+        if self._json is None:
+            try:
+                self._json = json_loads(self.body)
+            except ValueError as e:
+                _LOGGER.error("Error decoding response: %s", str(e))
+                self._json = {}
+        return self._json
+
+
+# Poll-plan endpoints whose state a sendAppController key press can change.
+KEY_PRESS_ENDPOINTS = {
+    "surround": ("smart_mode",),
+    "power": ("info", "eq", "night_mode", "smart_mode", "pure_voice"),
+    "mute": ("info",),
+    "volumeUp": ("info",),
+    "volumeDown": ("info",),
+    "musicPlayPause": ("info",),
+    "keyRear": ("rears",),
+    "source-hdmi-switch": ("info",),
+    "bluetooth": ("info",),
+    "source-tv": ("info",),
+}
+
+def _identityChanged(current, cached, fields):
+    return any(current.get(field) != cached.get(field) for field in fields)
+
+
 class Coordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
-    def __init__(self, address, scan_interval, hass=None, entry=None):
+    def __init__(self, address, scan_interval, hass=None, entry=None, httpPort=443, upnpPort=59152):
         """Initialize the coordinator."""
         self.address = address
         self.pollingRate = scan_interval
-        self.data = {}
+        self.data = SoundbarState()
+        self._newFirmware = False
+        self.httpApiUrl = f'https://{address}:{httpPort}/httpapi.asp'
+        self.upnpUrl = f'http://{address}:{upnpPort}/upnp/control'
+        self.upnpEventUrl = f'http://{address}:{upnpPort}/upnp/event'
+        options = entry.data if entry is not None else {}
+        self.maxConcurrentRequests = int(options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS))
+        self.requestPolicy = RequestPolicy.fromOptions(options)
+        self.stats = DeviceStats()
+        modeInterval = int(options.get(CONF_MODE_INTERVAL, DEFAULT_MODE_INTERVAL))
+        self._modeInterval = modeInterval
+
+        # Endpoint -> (getter, cadence in seconds). None polls on every cycle.
+        self.pollPlan = {
+            "info": (self.requestInfo, None),
+            "eq": (self.getEQ, modeInterval),
+            "eq_presets": (self.getEQPresets, int(options.get(CONF_EQ_PRESETS_INTERVAL, DEFAULT_EQ_PRESETS_INTERVAL))),
+            "night_mode": (self.getNightMode, modeInterval),
+            "rears": (self.getRearSpeaker, int(options.get(CONF_REARS_INTERVAL, DEFAULT_REARS_INTERVAL))),
+            "smart_mode": (self.getSmartMode, modeInterval),
+            "pure_voice": (self.getPureVoice, modeInterval),
+        }
+        self._nextPoll = {}
+
+        self.adaptivePolling = bool(options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING))
+        self.idleInterval = int(options.get(CONF_IDLE_INTERVAL, DEFAULT_IDLE_INTERVAL))
+        # Endpoints re-read on every cycle while boosted after user activity.
+        self._boostEndpoints = [endpoint for endpoint, (_, interval) in self.pollPlan.items() if not interval or interval <= modeInterval]
+        self._boostUntil = 0.0
+        # When the soundbar was first seen stopped or paused, None while playing.
+        self._idleSince = None
+
+        self.upnpEvents = bool(options.get(CONF_UPNP_EVENTS, DEFAULT_UPNP_EVENTS))
+        self._events = None
 
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        self.sslcontext = ssl_context
+        self.hass = hass
+        self.sslcontext = None
+        self._session = None
+        # Command -> (command generation, request) shared within a poll cycle.
+        self._cycleRequests = None
+        # Request name -> hash of the last response body. Parsed responses are
+        # only kept for the poll cycle that read them.
+        self._digests = {}
+        # Endpoint -> body hashes of the responses its data was last built from.
+        self._fingerprints = {}
+        # Endpoint or probed UPnP feature -> whether this device supports it.
+        self.capabilities = {}
+        self._rawDeviceInfo = {}
+        self._rawDeviceType = {}
+        self._capabilitiesFirmware = None
+        self._store = None
+        # Write target -> task sending its latest value, and the optimistic
+        # values that task settles.
+        self._pendingWrites = {}
+        self._writeUpdates = {}
+        # Write target -> task whose request is out right now.
+        self._sendingWrites = {}
+        self._pendingEQ = {}
+        # Data key -> value shown optimistically while its write is pending,
+        # and the last device value to roll back to if the write fails.
+        self._optimistic = {}
+        self._confirmed = {}
+        # Data key -> callbacks of the entities showing it.
+        self._keyListeners = {}
+        # Endpoints changed by commands and not read since.
+        self._staleEndpoints = set()
+        # Counts commands sent; endpoint -> count when a command last changed
+        # it, so reads that started before that command can be told apart.
+        self._commandGeneration = 0
+        self._commandStamps = {}
+        # Data and availability the key listeners were last notified about.
+        self._notifiedData = None
+        self._notifiedSuccess = True
+        self.health = HEALTH_CLOSED
+        self._failures = 0
+        self._backoff = 0
+        self._entry = entry
+        self._scheduler = None
+        # Delays the first regular poll to this device's scheduler slot.
+        self._slotTimer = None
+        self._slotReached = False
+        # Replaces the HTTP session when set, e.g. a traffic.ReplayTransport.
+        self.transport = None
+        self._recorder = None
     
         if hass != None and entry != None:
-            self._entry = entry
-            self.hass = hass
+            self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+            if options.get(CONF_CAPTURE_TRAFFIC, DEFAULT_CAPTURE_TRAFFIC):
+                self._recorder = TrafficRecorder(
+                    hass.config.path(DOMAIN, "traces", f"{entry.entry_id}_{time.strftime('%Y%m%d-%H%M%S')}.jsonl.gz"),
+                    hass.async_add_executor_job,
+                )
+                _LOGGER.info("Capturing traffic of %s to %s", address, self._recorder.path)
+            self._scheduler = async_get_scheduler(hass)
+            self._scheduler.register(self)
             super().__init__(
                 hass,
                 _LOGGER,
@@ -40,13 +280,14 @@ class Coordinator(DataUpdateCoordinator):
             )
 
     async def _SetupDeviceInfo(self):
-        #Setting up cert        
-        cert_path = self.hass.config.path("custom_components/jbl_integration/Cert.pem")
-        key_path = self.hass.config.path("custom_components/jbl_integration/Key.pem")
-        self.sslcontext.load_cert_chain(certfile=cert_path, keyfile=key_path)
-        
-        device_info = await self.getDeviceInfo()
-        device_Type = await self.getDeviceType() 
+        device_info, device_Type = await asyncio.gather(self.getDeviceInfo(), self.getDeviceType())
+        self._applyDeviceInfo(device_info, device_Type)
+        if device_info:
+            await self.async_probe_capabilities()
+
+    def _applyDeviceInfo(self, device_info, device_Type, newFirmware=None):
+        self._rawDeviceInfo = device_info
+        self._rawDeviceType = device_Type
 
         # Ensure device_info has all the expected keys and provide fallback values if necessary
         mac_address = device_info.get("wlan0_mac", "unknown_mac")
@@ -72,12 +313,72 @@ class Coordinator(DataUpdateCoordinator):
             "sw_version": firmware_version,
             "serial_number": serial_number,
         }
+        if newFirmware is not None:
+            self._newFirmware = newFirmware
+            return
         try:
             self._newFirmware = int(firmware_version.split('.')[0])>24 or int(firmware_version.split('.')[2])>31
             _LOGGER.debug("JBL one 3.0 Detected" if self._newFirmware else "Older firmware then JBL one 3.0")
         except Exception as e:
             self._newFirmware = False
-            
+
+    async def async_load_cache(self):
+        """Restore device info, capabilities and last state from storage.
+
+        Returns True when the cache was complete enough to set up entities
+        without talking to the soundbar.
+        """
+        cache = await self._store.async_load()
+        if not cache or not cache.get("device_info"):
+            return False
+        self._applyDeviceInfo(cache["device_info"], cache.get("device_type", {}), cache.get("new_firmware", False))
+        self._capabilitiesFirmware = cache.get("capabilities_firmware")
+        if self._capabilitiesFirmware == self._rawDeviceInfo.get("firmware"):
+            self.capabilities = cache.get("capabilities", {})
+        self.data = SoundbarState(cache.get("data"))
+        _LOGGER.debug("Restored %s from cache", self.address)
+        return True
+
+    async def async_revalidate(self):
+        """Re-read device info after a cached setup and refresh the state.
+
+        A changed device identity or firmware reloads the entry so entities are
+        rebuilt for what the soundbar now reports.
+        """
+        try:
+            device_info, device_Type = await asyncio.gather(self.getDeviceInfo(), self.getDeviceType())
+        except Exception as e:
+            _LOGGER.debug("Could not revalidate %s, keeping cached device info: %s", self.address, str(e))
+            device_info = {}
+        if device_info:
+            if _identityChanged(device_info, self._rawDeviceInfo, DEVICE_INFO_IDENTITY) or (
+                device_Type and _identityChanged(device_Type, self._rawDeviceType, DEVICE_TYPE_IDENTITY)
+            ):
+                _LOGGER.info("Device info of %s changed, reloading", self.address)
+                self._applyDeviceInfo(device_info, device_Type or self._rawDeviceType)
+                # The reloaded entry reads the cache with a new Store, which
+                # does not see this one's delayed writes: save right away.
+                await self._store.async_save(self._cacheData())
+                self.hass.config_entries.async_schedule_reload(self._entry.entry_id)
+                return
+        if self._capabilitiesFirmware != self._rawDeviceInfo.get("firmware"):
+            await self.async_probe_capabilities()
+        await self.async_refresh()
+
+    def _cacheData(self):
+        return {
+            "device_info": self._rawDeviceInfo,
+            "device_type": self._rawDeviceType,
+            "new_firmware": self._newFirmware,
+            "capabilities": self.capabilities,
+            "capabilities_firmware": self._capabilitiesFirmware,
+            "data": self.data.asDict() if self.data is not None else {},
+        }
+
+    def _scheduleCacheSave(self):
+        if self._store is not None:
+            self._store.async_delay_save(self._cacheData, CACHE_SAVE_DELAY)
+
     @property
     def device_info(self):
         """Return device information about this entity."""
@@ -88,96 +389,735 @@ class Coordinator(DataUpdateCoordinator):
         """Return if the JBL is part of the JBL one 3.0 software"""
         return self._newFirmware
 
+    async def _async_get_session(self):
+        """Return the device session, creating it on first use.
+
+        One keep-alive connector per device lets consecutive polls reuse TCP
+        connections and TLS sessions instead of handshaking on every request.
+        """
+        if self.sslcontext is None:
+            self.sslcontext = await async_get_ssl_context(self.hass)
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=max(1, self.maxConcurrentRequests),
+                ttl_dns_cache=300,
+                keepalive_timeout=max(30, 2 * int(self.pollingRate or 5)),
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def _request(self, method, url, idempotent, raw=False, **kwargs):
+        """Send one device request under the request policy.
+
+        Returns the status and body text, or the undecoded body bytes when raw
+        is set. Idempotent reads are retried with
+        jittered backoff on transport errors and 5xx answers; everything else
+        is sent exactly once. Raises the last transport error.
+        """
+        session = await self._async_get_session() if self.transport is None else None
+        if url.startswith("https:"):
+            # The soundbar's HTTPS API wants the client certificate context.
+            kwargs.setdefault("ssl", self.sslcontext)
+        policy = self.requestPolicy
+        attempts = policy.attempts(idempotent)
+        name = requestName(url, kwargs.get("headers"), kwargs.get("data"))
+        for attempt in range(attempts):
+            last = attempt + 1 == attempts
+            async with self._globalRequestSlot():
+                start = time.monotonic()
+                try:
+                    if self.transport is not None:
+                        status, text = await self.transport.request(method, url, **kwargs)
+                        if raw:
+                            text = text.encode()
+                    else:
+                        async with session.request(method, url, timeout=policy.timeout, **kwargs) as response:
+                            text = await response.read() if raw else await response.text()
+                            status = response.status
+                except (aiohttp.ClientError, TimeoutError) as e:
+                    timedOut = isinstance(e, TimeoutError)
+                    self.stats.recordRequest(name, time.monotonic() - start, OUTCOME_TIMEOUT if timedOut else OUTCOME_FAILURE)
+                    if self._recorder is not None:
+                        self._recorder.record(method, url, kwargs.get("headers"), kwargs.get("data"), None, ERROR_TIMEOUT if timedOut else ERROR_CLIENT, time.monotonic() - start)
+                    if last:
+                        raise
+                    _LOGGER.debug("Retrying %s %s after %s", method, url, str(e) or type(e).__name__)
+                else:
+                    self.stats.recordRequest(name, time.monotonic() - start, OUTCOME_SUCCESS if status == 200 else OUTCOME_FAILURE)
+                    if self._recorder is not None:
+                        self._recorder.record(method, url, kwargs.get("headers"), kwargs.get("data"), status, text, time.monotonic() - start)
+                    if last or status not in RETRY_STATUSES:
+                        return status, text
+                    _LOGGER.debug("Retrying %s %s after status %s", method, url, status)
+            await asyncio.sleep(policy.retryDelay(attempt))
+
+    def _globalRequestSlot(self):
+        if self._scheduler is None:
+            return contextlib.nullcontext()
+        return self._scheduler.request()
+
+    @callback
+    def _schedule_refresh(self):
+        """Start regular polls on this device's slot of the shared scheduler.
+
+        Only the first poll waits for the slot; later ones are scheduled by
+        the base class one interval after the previous, so devices started
+        together stay out of phase. A refresh before the slot replaces the
+        slot's poll.
+        """
+        if self._slotTimer is not None:
+            self._slotTimer.cancel()
+            self._slotTimer = None
+        if (
+            self._scheduler is None
+            or self._slotReached
+            or self.update_interval is None
+            or (self.config_entry and self.config_entry.pref_disable_polling)
+        ):
+            super()._schedule_refresh()
+            return
+        self._slotReached = True
+        interval = self.update_interval.total_seconds()
+        now = self.hass.loop.time()
+        # Aim for the first slot half an interval out, so the first poll is
+        # neither right after setup's refresh nor more than an interval late.
+        delay = self._scheduler.nextPoll(self, now + interval / 2, interval) - now
+        self._slotTimer = self.hass.loop.call_later(delay, self._slotStarted)
+
+    @callback
+    def _slotStarted(self):
+        self._slotTimer = None
+        self._createTask(self.async_refresh(), f"{DOMAIN} first poll {self.address}")
+
+    async def async_close(self):
+        """Close the device session and its pooled connections."""
+        if self._scheduler is not None:
+            self._scheduler.unregister(self)
+        if self._slotTimer is not None:
+            self._slotTimer.cancel()
+            self._slotTimer = None
+        await self.async_stop_events()
+        for task in self._pendingWrites.values():
+            task.cancel()
+        for task in self._sendingWrites.values():
+            task.cancel()
+        self._pendingWrites.clear()
+        self._writeUpdates.clear()
+        self._sendingWrites.clear()
+        if self._store is not None and self._rawDeviceInfo:
+            # Replaces the delayed save, which a reloaded entry's new Store
+            # would not see and could later overwrite its cache with.
+            await self._store.async_save(self._cacheData())
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._recorder is not None:
+            await self._recorder.async_close()
+
+    async def async_start_events(self, callbackHost=None):
+        """Subscribe to UPnP transport and rendering events from the device.
+
+        Polling carries on as before until the subscriptions are confirmed, and
+        resumes whenever they fail.
+        """
+        if callbackHost is None:
+            callbackHost = await async_get_source_ip(self.hass, target_ip=self.address)
+        self._events = UpnpEventSubscriber(
+            await self._async_get_session(),
+            self.upnpEventUrl,
+            callbackHost,
+            self._handleEvent,
+            self._eventStatusChanged,
+        )
+        await self._events.async_start()
+
+    async def async_stop_events(self):
+        if self._events is not None:
+            await self._events.async_stop()
+            self._events = None
+
+    def _handleEvent(self, updates):
+        data = self.data or SoundbarState()
+        if "transport_state" in updates and updates["transport_state"] != data.get("transport_state"):
+            # Play medium (and with it power state) is only reported by GetInfoEx.
+            self.invalidate("info")
+        # Let the next GetInfoEx overwrite event values even if it is unchanged.
+        self._fingerprints.pop("info", None)
+        # Values of writes still settling stay shown until they are confirmed.
+        self.async_set_updated_data(data.merged(updates, self._optimistic))
+
+    def _eventStatusChanged(self, subscribed):
+        # While events flow, transport info only needs an occasional safety poll.
+        if subscribed == (self.pollPlan["info"][1] is not None):
+            return
+        _LOGGER.debug("UPnP events %s for %s", "active" if subscribed else "unavailable", self.address)
+        self.pollPlan["info"] = (self.requestInfo, self._modeInterval if subscribed else None)
+        self.invalidate("info")
+
+    def _createTask(self, coro, name):
+        if self._store is not None:
+            # Tied to the config entry so unloading cancels it.
+            return self._entry.async_create_background_task(self.hass, coro, name)
+        return asyncio.ensure_future(coro)
+
+    def queueWrite(self, target, send, updates=None, toggle=False):
+        """Send a write for target after a short settle window, last write wins.
+
+        send is a zero-argument coroutine function returning True on success.
+        A newer write for the same target cancels the pending one, even if its
+        request is already in flight, so a burst of slider events ends in a
+        single request.
+
+        updates are the data values the write will produce. They are shown to
+        listeners right away and kept over polled values until the write
+        finishes; a failed write rolls them back, and a refresh afterwards
+        reconciles with what the device actually reports.
+
+        A toggle write cannot be taken back once its request is out, so a
+        newer write waits for it instead and then decides afresh.
+        """
+        previous = self._pendingWrites.get(target)
+        waitFor = self._sendingWrites.get(target) if toggle else None
+        if previous is not None and previous is not waitFor and not previous.done():
+            previous.cancel()
+            # The cancelled write never settles; this one settles its values
+            # too, e.g. the first of two EQ bands moved together.
+            updates = {**self._writeUpdates.get(target, {}), **(updates or {})}
+        if updates:
+            self._applyOptimistic(updates)
+        task = self._createTask(self._settleAndSend(target, send, updates, waitFor), f"{DOMAIN}_write_{target}")
+        self._pendingWrites[target] = task
+        self._writeUpdates[target] = updates or {}
+        return task
+
+    async def _settleAndSend(self, target, send, updates=None, waitFor=None):
+        await asyncio.sleep(COMMAND_SETTLE_TIME)
+        if waitFor is not None:
+            # Not awaited directly: cancelling this write must not cancel it.
+            await asyncio.wait((waitFor,))
+        task = asyncio.current_task()
+        self._sendingWrites[target] = task
+        try:
+            sent = await send()
+        except Exception as e:
+            _LOGGER.error("Error sending %s to %s: %s", target, self.address, str(e))
+            sent = False
+        finally:
+            if self._sendingWrites.get(target) is task:
+                del self._sendingWrites[target]
+            superseded = self._pendingWrites.get(target) is not task
+            if not superseded:
+                del self._pendingWrites[target]
+                del self._writeUpdates[target]
+        if updates:
+            self._settleOptimistic(updates, sent, superseded)
+        if self._store is not None:
+            await self.async_refresh_stale()
+
+    def _applyOptimistic(self, updates):
+        for key in updates:
+            if key not in self._optimistic:
+                self._confirmed[key] = self.data.get(key)
+        self._optimistic.update(updates)
+        self.data = self.data.merged(updates)
+        self._notifyListeners()
+
+    def _settleOptimistic(self, updates, sent, superseded=False):
+        if superseded:
+            # A newer write to the same target owns these keys now; if this
+            # one went through, its values are what the newer one rolls back to.
+            if sent:
+                for key, value in updates.items():
+                    if key in self._optimistic:
+                        self._confirmed[key] = value
+            return
+        rollback = {}
+        for key in updates:
+            if key not in self._optimistic:
+                continue
+            del self._optimistic[key]
+            confirmed = self._confirmed.pop(key, None)
+            if not sent:
+                rollback[key] = confirmed
+        if rollback:
+            self.data = self.data.merged(rollback)
+            self._notifyListeners()
+
+    def _notifyListeners(self):
+        if self._store is not None:
+            self.async_update_listeners()
+
+    def queueVolume(self, value: float):
+        """Queue a volume change; rapid slider moves collapse into one request."""
+        return self.queueWrite("volume", lambda: self.setVolume(value), {"volume_level": str(round(value))})
+
+    def queueEQ(self, value: float, frequency):
+        """Queue a change of one EQ band; bands moved together merge into one write."""
+        self._pendingEQ[frequency] = value
+        return self.queueWrite("eq", self._sendPendingEQ, {frequency: value})
+
+    def queueNightMode(self, value: bool):
+        return self.queueWrite("night_mode", lambda: self.setNightMode(value), {"NightMode": "on" if value else "off"})
+
+    def queuePureVoice(self, value: bool):
+        return self.queueWrite("pure_voice", lambda: self.setPureVoice(value), {"PureVoice": "on" if value else "off"})
+
+    def queueSmartMode(self, value: bool):
+        """Queue a smart mode change; the device only offers a toggle key."""
+        async def send():
+            # Compare with the device value, not the optimistic one: an
+            # earlier toggle may have been superseded before it was sent.
+            if (self._confirmed.get("SmartMode") == "on") == value:
+                return True
+            return await self._send_command("surround")
+        return self.queueWrite("smart_mode", send, {"SmartMode": "on" if value else "off"}, toggle=True)
+
+    def queueEQPreset(self, eq_id: str):
+        presetName = self.data.get("eq_preset_map", {}).get(eq_id)
+        return self.queueWrite("eq_preset", lambda: self.setActiveEQPreset(eq_id), {"eq_active_preset": presetName, "eq_active_id": eq_id})
+
+    async def _sendPendingEQ(self):
+        bands = dict(self._pendingEQ)
+        if not await self.setEQBands(bands):
+            return False
+        # Keep bands changed again while this write was in flight.
+        for band, value in bands.items():
+            if self._pendingEQ.get(band) == value:
+                del self._pendingEQ[band]
+        return True
+
     async def _UpdatePollingrate(self,pollingRate):
         self.update_interval = pollingRate
 
     async def _send_command(self, command):
+        self._commandSent(*KEY_PRESS_ENDPOINTS.get(command, ()))
         # Disable SSL warnings
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
         """Send a command to the device."""
-        url = f'https://{self.address}/httpapi.asp'
+        url = self.httpApiUrl
         payload = f'command=sendAppController&payload={{"key_pressed": "{command}"}}'
-        async with aiohttp.ClientSession() as session:
-            async with asyncio.timeout(10):
-                async with session.post(url, data=payload,  ssl=self.sslcontext) as response:
-                    if response.status != 200:
-                        _LOGGER.error("Failed to send command: %s", response.status)
+        # Key presses are never retried: a repeated press would toggle twice.
+        status, _ = await self._request("POST", url, idempotent=False, data=payload)
+        if status != 200:
+            _LOGGER.error("Failed to send command: %s", status)
+            return False
+        return True
 
-    async def _async_update_data(self):
-        combined_data = {
-            **await self.requestInfo(),
-            **await self.getEQ(),
-            **await self.getEQPresets(),
-            **await self.getNightMode(),
-            **await self.getRearSpeaker(),
-            **await self.getSmartMode(),
-            **await self.getPureVoice(),
+    def invalidate(self, *endpoints):
+        """Make the given poll-plan endpoints due on the next cycle."""
+        for endpoint in endpoints:
+            self._nextPoll.pop(endpoint, None)
+
+    def boost(self):
+        """Poll faster, and more endpoints, for a while after user activity."""
+        if self.adaptivePolling:
+            self._boostUntil = time.monotonic() + BOOST_WINDOW
+
+    def _commandSent(self, *endpoints):
+        """Record a command; endpoints are the reads whose data it changes."""
+        self.invalidate(*endpoints)
+        self._staleEndpoints.update(endpoints)
+        self._commandGeneration += 1
+        for endpoint in endpoints:
+            self._commandStamps[endpoint] = self._commandGeneration
+        # The data of these endpoints may now differ from what the device
+        # answers even if the answer itself does not change.
+        for endpoint in endpoints:
+            self._fingerprints.pop(endpoint, None)
+        self.boost()
+
+    @property
+    def poweredOff(self):
+        """Return True when the last transport read says the soundbar is off."""
+        return bool(self.data) and self.data.get("play_medium") == "UNKNOWN"
+
+    def _idle(self, now):
+        """Return whether the soundbar is off, or stopped or paused for a while."""
+        if self.poweredOff:
+            return True
+        return self._idleSince is not None and now - self._idleSince >= IDLE_GRACE_PERIOD
+
+    def _dueEndpoints(self, now):
+        if self.adaptivePolling and now >= self._boostUntil and self._idle(now):
+            # Slim probe: only transport info until the soundbar wakes up or plays again.
+            return ["info"]
+        boosted = self.adaptivePolling and now < self._boostUntil
+        return [
+            endpoint for endpoint in self.pollPlan
+            # Endpoints the model does not support are never polled.
+            if self.capabilities.get(endpoint) is not False
+            and ((boosted and endpoint in self._boostEndpoints) or self._nextPoll.get(endpoint, 0) <= now)
+        ]
+
+    def _probeTargets(self):
+        targets = dict(PROBED_ENDPOINTS)
+        if self.newFirmware:
+            targets["eq"] = ("getEQList", "eq_list")
+        else:
+            targets["eq"] = ("getEQ", "eq_setting")
+        return targets
+
+    async def async_probe_capabilities(self):
+        """Find out which optional endpoints this model and firmware support.
+
+        An endpoint is only marked unsupported when the device answers without
+        the expected data; timeouts and connection errors leave it unknown so
+        it keeps being polled and is probed again next time.
+        """
+        targets = self._probeTargets()
+        probes = [self._probeCommand(command, key) for command, key in targets.values()]
+        probes += [self._probeAction(*action) for action in PROBED_ACTIONS.values()]
+        results = await asyncio.gather(*probes, return_exceptions=True)
+        for endpoint, result in zip([*targets, *PROBED_ACTIONS], results):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Could not probe %s on %s: %s", endpoint, self.address, str(result))
+                self.capabilities.pop(endpoint, None)
+            else:
+                self.capabilities[endpoint] = result
+        # The preset list comes from getEQList and only exists on new firmware.
+        self.capabilities["eq_presets"] = bool(self.newFirmware and self.capabilities.get("eq", True))
+        self._capabilitiesFirmware = self._rawDeviceInfo.get("firmware")
+        _LOGGER.debug("Capabilities of %s: %s", self.address, self.capabilities)
+        self._scheduleCacheSave()
+
+    async def _probeCommand(self, command, key):
+        """Return whether command answers with key.
+
+        Raises on transport errors and on any answer other than 200, e.g. a
+        503 from a soundbar that is still booting, so the endpoint stays
+        unknown instead of being marked unsupported.
+        """
+        status, body = await self._request("GET", f'{self.httpApiUrl}?command={command}', idempotent=True, raw=True)
+        if status != 200:
+            raise aiohttp.ClientError(f"{command} answered with status {status}")
+        try:
+            return key in json_loads(body)
+        except (ValueError, TypeError):
+            return False
+
+    async def _probeAction(self, service, serviceType, action, arguments, element):
+        """Return whether the UPnP action answers with element.
+
+        Only a SOAP fault saying the action is not implemented counts as
+        unsupported; any other error raises like _probeCommand.
+        """
+        headers = {
+            "Content-type": 'text/xml;charset="utf-8"',
+            "Soapaction": f'"{serviceType}#{action}"',
         }
+        payload = (
+            '<?xml version="1.0" encoding="utf-8" standalone="yes"?>'
+            '<s:Envelope s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/" xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">'
+            f'<s:Body><u:{action} xmlns:u="{serviceType}">{arguments}</u:{action}></s:Body></s:Envelope>'
+        )
+        status, text = await self._request("POST", f"{self.upnpUrl}/{service}", idempotent=True, headers=headers, data=payload)
+        if status == 200:
+            return has_element(text, element)
+        if is_unsupported_action(text):
+            return False
+        raise aiohttp.ClientError(f"{action} answered with status {status}")
+
+    def _adaptPollingRate(self, previous, current):
+        if not self.adaptivePolling:
+            return
+        now = time.monotonic()
+        if current.get("transport_state") not in IDLE_TRANSPORT_STATES:
+            self._idleSince = None
+        elif self._idleSince is None:
+            self._idleSince = now
+        if previous and any(previous.get(key) != current.get(key) for key in ACTIVITY_KEYS):
+            self.boost()
+        if now < self._boostUntil:
+            seconds = min(BOOST_SCAN_INTERVAL, int(self.pollingRate))
+        elif self._idle(now):
+            seconds = max(self.idleInterval, int(self.pollingRate))
+        else:
+            seconds = int(self.pollingRate)
+        self.update_interval = timedelta(seconds=seconds)
+
+    async def _readEndpoints(self, endpoints, now):
+        """Run the getters of the given endpoints.
+
+        Returns their merged data and the endpoints that returned nothing.
+        """
+        # Bound the fan-out so a slow soundbar never sees more than
+        # maxConcurrentRequests requests from one cycle at the same time.
+        semaphore = asyncio.Semaphore(max(1, self.maxConcurrentRequests))
+
+        async def bounded(getter):
+            async with semaphore:
+                return await getter()
+
+        started = self._commandGeneration
+        # A partial refresh overlapping a poll cycle shares its requests.
+        ownsCycle = self._cycleRequests is None
+        if ownsCycle:
+            self._cycleRequests = {}
+        tasks = [asyncio.ensure_future(bounded(self.pollPlan[endpoint][0])) for endpoint in endpoints]
+        try:
+            if tasks:
+                _, pending = await asyncio.wait(tasks, timeout=self.requestPolicy.cycleDeadline)
+                if pending:
+                    # Past the deadline: give up on the stragglers, including
+                    # the shared requests they were waiting for.
+                    _LOGGER.warning("Poll cycle for %s exceeded its %s s deadline", self.address, self.requestPolicy.cycleDeadline)
+                    self.stats.deadlineMisses += 1
+                    shared = [request for _, request in self._cycleRequests.values()] if ownsCycle else []
+                    for task in [*pending, *shared]:
+                        task.cancel()
+                    await asyncio.wait(pending)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            if ownsCycle:
+                self._cycleRequests = None
+        results = [
+            TimeoutError("poll cycle deadline exceeded") if task.cancelled() else task.exception() or task.result()
+            for task in tasks
+        ]
+
+        combined_data = {}
+        failed = []
+        for endpoint, result in zip(endpoints, results):
+            # A command sent while this read was running may have changed the
+            # endpoint after the device answered; it then stays due and stale.
+            superseded = self._commandStamps.get(endpoint, 0) > started
+            if not superseded:
+                interval = self.pollPlan[endpoint][1]
+                if interval:
+                    self._nextPoll[endpoint] = now + interval
+                self._staleEndpoints.discard(endpoint)
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                _LOGGER.error("Error polling %s: %s", endpoint, str(result))
+                failed.append(endpoint)
+                continue
+            if superseded:
+                self._fingerprints.pop(endpoint, None)
+                continue
+            if result is UNCHANGED:
+                continue
+            if result:
+                self.capabilities[endpoint] = True
+            else:
+                failed.append(endpoint)
+            combined_data.update(result)
+        return combined_data, failed
+
+    async def _async_update_data(self):
+        now = time.monotonic()
+        if self.health != HEALTH_CLOSED:
+            # Half-open: one cheap read decides whether the soundbar is back.
+            self.health = HEALTH_HALF_OPEN
+            endpoints = ["info"]
+        else:
+            endpoints = self._dueEndpoints(now)
+        combined_data, failed = await self._readEndpoints(endpoints, now)
+        # Transport info answers whenever the soundbar is reachable.
+        if "info" in failed:
+            self._pollFailed()
+        elif "info" in endpoints:
+            if self.health == HEALTH_HALF_OPEN:
+                _LOGGER.info("%s is responding again, resuming polling", self.address)
+                self.invalidate(*self.pollPlan)
+                rest = [endpoint for endpoint in self._dueEndpoints(now) if endpoint != "info"]
+                rest_data, _ = await self._readEndpoints(rest, now)
+                combined_data.update(rest_data)
+                endpoints += rest
+                # Drop the backoff; adaptive polling may then adjust it.
+                self.update_interval = timedelta(seconds=int(self.pollingRate))
+            self.health = HEALTH_CLOSED
+            self._failures = 0
+            self._backoff = 0
+        elapsed = time.monotonic() - now
+        self.stats.recordCycle(elapsed, int(self.pollingRate))
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Poll cycle for %s (%s) took %.3f s", self.address, ", ".join(endpoints), elapsed)
 
-        # Ensure self.data is initialized to an empty dictionary if it is None
+        # Ensure self.data is initialized to an empty state if it is None
         if self.data is None:
-            self.data = {}
+            self.data = SoundbarState()
         
-        self.data.update(combined_data)
-        return combined_data
+        # Endpoints that were not due or answered as before keep their last
+        # known values; with nothing new the state object itself is kept.
+        data = self.data.merged(combined_data, self._optimistic) if combined_data else self.data
+        self._adaptPollingRate(self.data, data)
+        if combined_data:
+            self._scheduleCacheSave()
+        return data
+
+    def _pollFailed(self):
+        """Count a failed poll; open the breaker, or keep it open, when due."""
+        self._failures += 1
+        if self.health == HEALTH_CLOSED and self._failures < BREAKER_FAILURE_THRESHOLD:
+            return
+        if self.health == HEALTH_CLOSED:
+            self._backoff = max(int(self.pollingRate), BOOST_SCAN_INTERVAL)
+            _LOGGER.warning("%s is not responding, pausing polling", self.address)
+        self._backoff = min(self._backoff * 2, BREAKER_MAX_BACKOFF)
+        self.health = HEALTH_OPEN
+        self.update_interval = timedelta(seconds=self._backoff)
+        raise UpdateFailed(f"{self.address} is not responding, retrying in {self._backoff} s")
+
+    async def async_refresh_endpoints(self, *endpoints):
+        """Re-read only the given poll-plan endpoints.
+
+        The result is merged into data and only the entities whose keys changed
+        are notified; the regular poll schedule is left alone.
+        """
+        endpoints = [endpoint for endpoint in dict.fromkeys(endpoints) if endpoint in self.pollPlan and self.capabilities.get(endpoint) is not False]
+        if not endpoints:
+            return
+        now = time.monotonic()
+        combined_data, _ = await self._readEndpoints(endpoints, now)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Partial refresh for %s (%s) took %.3f s", self.address, ", ".join(endpoints), time.monotonic() - now)
+        if not combined_data:
+            return
+        for key in self._optimistic:
+            combined_data.pop(key, None)
+        previous = self.data or SoundbarState()
+        self.data = previous.merged(combined_data)
+        self._adaptPollingRate(previous, self.data)
+        self._scheduleCacheSave()
+        self._notifyListeners()
+
+    async def async_refresh_stale(self):
+        """Re-read the endpoints commands have changed since they were last read."""
+        endpoints, self._staleEndpoints = self._staleEndpoints, set()
+        await self.async_refresh_endpoints(*endpoints)
+
+    def async_add_key_listener(self, keys, update_callback):
+        """Call update_callback when any of the data keys changes.
+
+        A no-op regular listener is registered alongside so the refresh timer
+        keeps running while only key listeners are left.
+        """
+        removeListener = self.async_add_listener(lambda: None)
+        for key in keys:
+            self._keyListeners.setdefault(key, []).append(update_callback)
+
+        def remove():
+            removeListener()
+            for key in keys:
+                callbacks = self._keyListeners.get(key, [])
+                if update_callback in callbacks:
+                    callbacks.remove(update_callback)
+                if not callbacks:
+                    self._keyListeners.pop(key, None)
 
-    async def _getCommand(self, command):
+        return remove
+
+    @callback
+    def async_update_listeners(self):
+        """Notify regular listeners, and key listeners whose keys changed."""
+        super().async_update_listeners()
+        data = self.data or SoundbarState()
+        previous = self._notifiedData
+        self._notifiedData = data
+        if previous is None or self.last_update_success != self._notifiedSuccess:
+            # First update or availability change: every entity rewrites its state.
+            self._notifiedSuccess = self.last_update_success
+            self._notifyKeys(list(self._keyListeners))
+            return
+        if data is not previous:
+            self._notifyKeys(data.changedKeys(previous))
+
+    def _notifyKeys(self, keys):
+        notified = []
+        for key in keys:
+            for update_callback in list(self._keyListeners.get(key, ())):
+                if update_callback not in notified:
+                    notified.append(update_callback)
+                    update_callback()
+
+    async def _getCommand(self, command, endpoint):
+        """Return the JSON response for an httpapi.asp read command.
+
+        Returns UNCHANGED without parsing when endpoint's data was built from
+        the same bytes. While a poll cycle is running, every getter asking for
+        the same command shares one in-flight request and the same parsed
+        result, so the result must be treated as read-only. Requests started
+        before the last command are not shared, as their answer may predate it.
+        """
+        if self._cycleRequests is None:
+            response = await self._fetchCommand(command)
+        else:
+            generation, request = self._cycleRequests.get(command, (None, None))
+            if request is None or generation != self._commandGeneration:
+                request = asyncio.ensure_future(self._fetchCommand(command))
+                self._cycleRequests[command] = (self._commandGeneration, request)
+            response = await asyncio.shield(request)
+        if response is None:
+            return {}
+        if self._unchanged(endpoint, command):
+            return UNCHANGED
+        return response.json()
+
+    async def _fetchCommand(self, command):
         # Disable SSL warnings
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
-        url = f'https://{self.address}/httpapi.asp?command={command}'
+        url = f'{self.httpApiUrl}?command={command}'
         
         headers = {
             'Accept-Encoding': "gzip",
         }
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with asyncio.timeout(10):
-                    async with session.get(url, headers=headers,  ssl=self.sslcontext) as response:
-                        if response.status == 200:
-                            response_text = await response.text()
-                            response_json = json.loads(response_text)
-                            _LOGGER.debug(f"%s Response text: %s", command, response_text)
-                            return response_json
-                        else:
-                            _LOGGER.error(f"Failed to get %s: %s", command, response.status)
-                            return {}
-            except Exception as e:
-                _LOGGER.error(f"Error getting %s: %s", command, str(e))
-                return {}
+        try:
+            status, body = await self._request("GET", url, idempotent=True, raw=True, headers=headers)
+            if status == 200:
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("%s response: %s", command, body.decode("utf-8", "replace"))
+                response = _Response(body)
+                self._digests[command] = response.digest
+                return response
+            else:
+                _LOGGER.error(f"Failed to get %s: %s", command, status)
+                return None
+        except Exception as e:
+            _LOGGER.error(f"Error getting %s: %s", command, str(e))
+            return None
+
+    def _unchanged(self, endpoint, *names):
+        """Return whether endpoint's data came from the last responses to names."""
+        return self._fingerprints.get(endpoint) == tuple(self._digests.get(name) for name in names)
+
+    def _builtFrom(self, endpoint, *names):
+        """Remember that endpoint's data now comes from the last responses to names."""
+        self._fingerprints[endpoint] = tuple(self._digests[name] for name in names)
 
     async def getDeviceInfo(self):
         # Disable SSL warnings
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
-        url = f'https://{self.address}/httpapi.asp?command=getDeviceInfo'
+        url = f'{self.httpApiUrl}?command=getDeviceInfo'
         headers = {
         'Accept-Encoding': "gzip",
         }
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with asyncio.timeout(10):
-                    async with session.get(url, headers=headers,  ssl=self.sslcontext) as response:
-                        if response.status == 200:
-                            response_text = await response.text()
-                            response_json = json.loads(response_text)
-                            #_LOGGER.debug("Device Info Response text: %s", response_text)
-                            #get data out of JSON
-                            device_info = response_json["device_info"]
-                            return device_info
-                        else:
-                            _LOGGER.error("Failed to get device info: %s", response.status)
-                            return {}
-
-            except Exception as e:
-                _LOGGER.error("Error getting device info: %s", str(e))
+        try:
+            status, body = await self._request("GET", url, idempotent=True, raw=True, headers=headers)
+            if status == 200:
+                response_json = json_loads(body)
+                #_LOGGER.debug("Device Info Response text: %s", body)
+                #get data out of JSON
+                device_info = response_json["device_info"]
+                return device_info
+            else:
+                _LOGGER.error("Failed to get device info: %s", status)
                 return {}
 
+        except Exception as e:
+            _LOGGER.error("Error getting device info: %s", str(e))
+            return {}
+
     async def getDeviceType(self):
         """Fetch data from the API."""
-        url = f"http://{self.address}:59152/upnp/control/rendercontrol1"
+        url = f'{self.upnpUrl}/rendercontrol1'
         
         payload = """<?xml version="1.0" encoding="utf-8" standalone="yes"?>
         <s:Envelope s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/" xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
@@ -191,35 +1131,17 @@ class Coordinator(DataUpdateCoordinator):
         'Soapaction': "\"urn:schemas-upnp-org:service:RenderingControl:1#GetControlDeviceInfo\""
         }
 
-        try:        
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, data=payload, headers=headers) as response:
-                    if response.status == 200:
-                        response_text = await response.text()
-                        
-                        # Parse XML response
-                        namespace = {
-                            's': 'http://schemas.xmlsoap.org/soap/envelope/', 
-                            'u': 'urn:schemas-upnp-org:service:RenderingControl:1'
-                        }
-                        from xml.etree import ElementTree as ET
-                        root = ET.fromstring(response_text)
-                        
-                        # Find the Status element
-                        status_element = root.find('.//u:GetControlDeviceInfoResponse/Status', namespace)
-                        
-                        if status_element is not None:
-                            # Get the text content of the Status element (which is a JSON string)
-                            status_json_str = status_element.text
-                            
-                            # Parse the JSON string into a Python dictionary
-                            status_data = json.loads(status_json_str)
-                            
-                            # Output the status data
-                            return status_data
-                        else:
-                            _LOGGER.error("Failed to fetch data: %s", response.status)
-                            return {}
+        try:
+            status, response_text = await self._request("POST", url, idempotent=True, data=payload, headers=headers)
+            if status == 200:
+                status_data = parse_control_device_info(response_text)
+                if status_data:
+                    return status_data
+                _LOGGER.error("Failed to fetch data: %s", status)
+                return {}
+            else:
+                _LOGGER.error("Failed to fetch data: %s", status)
+                return {}
         except Exception as e:
             _LOGGER.error("Error fetching data: %s", str(e))
             raise ConfigEntryNotReady(f"Timeout while connecting to {self.address}") from e
@@ -229,7 +1151,7 @@ class Coordinator(DataUpdateCoordinator):
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
         """Fetch data from the API."""
-        url = f'http://{self.address}:59152/upnp/control/rendertransport1'
+        url = f'{self.upnpUrl}/rendertransport1'
         headers = {
             "Content-type": 'text/xml;charset="utf-8"',
             "Soapaction": '"urn:schemas-upnp-org:service:AVTransport:1#GetInfoEx"'
@@ -244,55 +1166,29 @@ class Coordinator(DataUpdateCoordinator):
           </s:Body>
         </s:Envelope>
         """
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with asyncio.timeout(10):
-                    async with session.post(url, headers=headers, data=payload) as response:
-                        if response.status == 200:
-                            response_text = await response.text()
-                            _LOGGER.debug("Response text: %s", response_text)
-                            # Parse the XML response manually, as it's not JSON
-                            from xml.etree import ElementTree as ET
-                            root = ET.fromstring(response_text)
-                            namespaces = {
-                                's': 'http://schemas.xmlsoap.org/soap/envelope/',
-                                'u': 'urn:schemas-upnp-org:service:AVTransport:1'
-                            }
-                            try:
-                                play_medium = root.find('.//u:GetInfoExResponse/PlayMedium', namespaces).text
-                                volume_level = root.find('.//u:GetInfoExResponse/CurrentVolume', namespaces).text
-                                track = root.find('.//u:GetInfoExResponse/TrackURI', namespaces).text
-                                transport_state = root.find('.//u:GetInfoExResponse/CurrentTransportState', namespaces).text
-                                transport_status = root.find('.//u:GetInfoExResponse/CurrentTransportStatus', namespaces).text
-                                track_duration = root.find('.//u:GetInfoExResponse/TrackDuration', namespaces).text
-                                mute = root.find('.//u:GetInfoExResponse/CurrentMute', namespaces).text
-                                channel = root.find('.//u:GetInfoExResponse/CurrentChannel', namespaces).text
-                                slaves = root.find('.//u:GetInfoExResponse/SlaveFlag', namespaces).text
-                                gatheredData = {
-                                    "play_medium": play_medium,
-                                    "volume_level": volume_level,
-                                    "track": track,
-                                    "transport_state": transport_state,
-                                    "transport_status": transport_status,
-                                    "track_duration": track_duration,
-                                    "mute": mute,
-                                    "channel": channel,
-                                    "slaves": slaves,
-                                }
-                                return gatheredData
-                            except AttributeError:
-                                _LOGGER.error("Could not find necessary data in the response")
-                                return {}
-                        else:
-                            _LOGGER.error("Failed to fetch data: %s", response.status)
-                            return {}
-            except Exception as e:
-                _LOGGER.error("Error fetching data: %s", str(e))
+        try:
+            status, body = await self._request("POST", url, idempotent=True, raw=True, headers=headers, data=payload)
+            if status == 200:
+                self._digests["GetInfoEx"] = hash(body)
+                if self._unchanged("info", "GetInfoEx"):
+                    return UNCHANGED
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("GetInfoEx response: %s", body.decode("utf-8", "replace"))
+                values = parse_info_ex(body)
+                if values:
+                    self._builtFrom("info", "GetInfoEx")
+                return values
+            else:
+                _LOGGER.error("Failed to fetch data: %s", status)
                 return {}
+        except Exception as e:
+            _LOGGER.error("Error fetching data: %s", str(e))
+            return {}
 
     async def setVolume(self, value: float):
+        self._commandSent("info")
         """Fetch data from the API."""
-        url = f'http://{self._entry.data[CONF_ADDRESS]}:59152/upnp/control/rendercontrol1'
+        url = f'{self.upnpUrl}/rendercontrol1'
         headers = {
             "Content-type": 'text/xml;charset="utf-8"',
             'Soapaction': "\"urn:schemas-upnp-org:service:RenderingControl:1#SetVolume\""
@@ -300,131 +1196,124 @@ class Coordinator(DataUpdateCoordinator):
         payload = "<?xml version=\"1.0\" encoding=\"utf-8\" standalone=\"yes\"?><s:Envelope s:encodingStyle=\"http://schemas.xmlsoap.org/soap/encoding/\" xmlns:s=\"http://schemas.xmlsoap.org/soap/envelope/\"><s:Body><u:SetVolume xmlns:u=\"urn:schemas-upnp-org:service:RenderingControl:1\"><InstanceID>0</InstanceID><Channel>Single</Channel><DesiredVolume>DesiredVolumeNumber</DesiredVolume></u:SetVolume></s:Body></s:Envelope>"
         payload = payload.replace("DesiredVolumeNumber", str(round(value)) )
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with asyncio.timeout(10):
-                    async with session.post(url, headers=headers, data=payload) as response:
-                        if response.status != 200:
-                            _LOGGER.error("Failed to set volume: %s", response.status)
-                            return {}
-            except Exception as e:
-                _LOGGER.error("Error setting volume: %s", str(e))
-                return {}
+        try:
+            status, _ = await self._request("POST", url, idempotent=False, headers=headers, data=payload)
+            if status != 200:
+                _LOGGER.error("Failed to set volume: %s", status)
+                return False
+            return True
+        except Exception as e:
+            _LOGGER.error("Error setting volume: %s", str(e))
+            return False
 
     async def getEQ(self):
-        # Disable SSL warnings
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
-        if self.newFirmware: 
-            url = f'https://{self.address}/httpapi.asp?command=getEQList' 
-        else:
-            url = f'https://{self.address}/httpapi.asp?command=getEQ' 
-        headers = {
-        'Accept-Encoding': "gzip",
-        }
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with asyncio.timeout(10):
-                    async with session.get(url, headers=headers,  ssl=self.sslcontext) as response:
-                        if response.status == 200:
-                            response_text = await response.text()
-                            response_json = json.loads(response_text)
-                            _LOGGER.debug("EQ Response text: %s", response_text)
-                            #get data out of JSON
-                            if self.newFirmware:
-                                active_id = str(response_json.get("active_eq_id", "0"))
-                                active_preset = None
-                                for item in response_json.get("eq_list", []):
-                                    if str(item.get("eq_id", "")) == active_id:
-                                        active_preset = item
-                                        break
-                                if active_preset is None and response_json.get("eq_list"):
-                                    active_preset = response_json["eq_list"][0]
-                                if active_preset is None:
-                                    return {}
-                                gain = active_preset["eq_payload"]["gain"]
-                                eqList = {
-                                        "125Hz":gain[0],    #Min -9, Max 6, step 0.5
-                                        "250Hz":gain[1],    #Min -6, Max 6, step 0.5
-                                        "500Hz":gain[2],    #Min -6, Max 6, step 0.5
-                                        "1000Hz":gain[3],   #Min -6, Max 6, step 0.5
-                                        "2000Hz":gain[4],   #Min -6, Max 6, step 0.5
-                                        "4000Hz":gain[5],   #Min -6, Max 6, step 0.5
-                                        "8000Hz":gain[6],   #Min -6, Max 6, step 0.5
-                                    }
-                                return eqList
-                            else:
-                                gain = response_json["eq_setting"]["eq_payload"]["gain"]
-                                gatheredData = {
-                                    "EQ_1_Low": gain[0],
-                                    "EQ_2_Mid": gain[1],
-                                    "EQ_3_High": gain[2]
-                                }
-                                return gatheredData
-                        else:
-                            _LOGGER.error("Failed to get EQ: %s", response.status)
-                            return {}
-            except Exception as e:
-                _LOGGER.warning("Error getting EQ: %s", str(e))
-                return {}
+        command = "getEQList" if self.newFirmware else "getEQ"
+        response_json = await self._getCommand(command, "eq")
+        if response_json is UNCHANGED:
+            return UNCHANGED
+        if not response_json:
+            return {}
+        try:
+            #get data out of JSON
+            if self.newFirmware:
+                active_id = str(response_json.get("active_eq_id", "0"))
+                if self.data and active_id != self.data.get("eq_active_id"):
+                    # Preset changed outside Home Assistant; refresh the preset list too.
+                    self.invalidate("eq_presets")
+                active_preset = None
+                for item in response_json.get("eq_list", []):
+                    if str(item.get("eq_id", "")) == active_id:
+                        active_preset = item
+                        break
+                if active_preset is None and response_json.get("eq_list"):
+                    active_preset = response_json["eq_list"][0]
+                if active_preset is None:
+                    return {}
+                gain = active_preset["eq_payload"]["gain"]
+                eqList = {
+                        "125Hz":gain[0],    #Min -9, Max 6, step 0.5
+                        "250Hz":gain[1],    #Min -6, Max 6, step 0.5
+                        "500Hz":gain[2],    #Min -6, Max 6, step 0.5
+                        "1000Hz":gain[3],   #Min -6, Max 6, step 0.5
+                        "2000Hz":gain[4],   #Min -6, Max 6, step 0.5
+                        "4000Hz":gain[5],   #Min -6, Max 6, step 0.5
+                        "8000Hz":gain[6],   #Min -6, Max 6, step 0.5
+                    }
+                self._builtFrom("eq", command)
+                return eqList
+            else:
+                gain = response_json["eq_setting"]["eq_payload"]["gain"]
+                gatheredData = {
+                    "EQ_1_Low": gain[0],
+                    "EQ_2_Mid": gain[1],
+                    "EQ_3_High": gain[2]
+                }
+                self._builtFrom("eq", command)
+                return gatheredData
+        except Exception as e:
+            _LOGGER.warning("Error getting EQ: %s", str(e))
+            return {}
 
     async def setEQ(self, value: float, frequency):
-        # Disable SSL warnings
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        return await self.setEQBands({frequency: value})
 
-        """Fetch data from the API."""
-        url = f'https://{self._entry.data[CONF_ADDRESS]}/httpapi.asp'
+    async def setEQBands(self, bands):
+        """Write the given band gains in one request, keeping the other bands.
+
+        Returns True when the soundbar accepted the write.
+        """
+        self._commandSent("eq", "eq_presets")
+
+        url = self.httpApiUrl
         headers = {
         'Accept-Encoding': "gzip",
         }
         if self.newFirmware:
-            eqList = {
-                        "125Hz":self.data.get("125Hz",0),  #Min -9, Max 6, step 0.5
-                        "250Hz":self.data.get("250Hz",0),  #Min -6, Max 6, step 0.5
-                        "500Hz":self.data.get("500Hz",0),  #Min -6, Max 6, step 0.5
-                        "1000Hz":self.data.get("1000Hz",0), #Min -6, Max 6, step 0.5
-                        "2000Hz":self.data.get("2000Hz",0), #Min -6, Max 6, step 0.5
-                        "4000Hz":self.data.get("4000Hz",0), #Min -6, Max 6, step 0.5
-                        "8000Hz":self.data.get("8000Hz",0), #Min -6, Max 6, step 0.5
-                    }
-            eqList[frequency] = value
+            #Min -9 for 125Hz, -6 for the other bands, Max 6, step 0.5
+            eqList = {band: self.data.get(band, 0) for band in EQ_BANDS_NEW_FIRMWARE}
+            eqList.update(bands)
             payload = "command=setActiveEQ&payload={\"active_eq_id\":\"0\",\"band\":7,\"eq_payload\":{\"fs\":[125.0,250.0,500.0,1000.0,2000.0,4000.0,8000.0],\"gain\":[125Hz,250Hz,500Hz,1000Hz,2000Hz,4000Hz,8000Hz]}}"
 
             for key in eqList.keys():
                 payload = payload.replace(key,str(eqList.get(key))) 
         else:
+            eqList = {band: self.data.get(band) for band in EQ_BANDS_OLD_FIRMWARE}
+            eqList.update({band: round(value,1) for band, value in bands.items()})
             payload = "command=setEQ&payload={\"eq_id\":\"1\",\"eq_name\":\"Custom\",\"eq_payload\":{\"fs\":[150.0,1000.0,6000.0],\"gain\":[BassFrequency,MidFrequency,HighFrequency],\"q\":[0.7070000171661377,0.5,0.7070000171661377],\"type\":[17.0,11.0,16.0]},\"eq_status\":\"on\"}"
-            BassFrequency = str(self.data.get("EQ_1_Low")) if "EQ_1_Low"!= frequency else str(round(value,1))
-            MidFrequency = str(self.data.get("EQ_2_Mid")) if "EQ_2_Mid"!= frequency else str(round(value,1))
-            HighFrequency = str(self.data.get("EQ_3_High")) if "EQ_3_High"!= frequency else str(round(value,1))
+            BassFrequency = str(eqList["EQ_1_Low"])
+            MidFrequency = str(eqList["EQ_2_Mid"])
+            HighFrequency = str(eqList["EQ_3_High"])
             payload = payload.replace("BassFrequency",BassFrequency).replace("MidFrequency",MidFrequency).replace("HighFrequency",HighFrequency)
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with asyncio.timeout(10):
-                    async with session.post(url, headers=headers, data=payload,  ssl=self.sslcontext) as response:
-                        if response.status != 200:
-                            _LOGGER.error("Failed to set EQ: %s", response.status)
-                            return {}
-                        else:
-                            return {}
-            except Exception as e:
-                _LOGGER.error("Error setting EQ: %s", str(e))
-                return {}
+        try:
+            status, _ = await self._request("POST", url, idempotent=False, headers=headers, data=payload)
+            if status != 200:
+                _LOGGER.error("Failed to set EQ: %s", status)
+                return False
+        except Exception as e:
+            _LOGGER.error("Error setting EQ: %s", str(e))
+            return False
+        # The device now holds these gains; later single-band writes build on them.
+        self.data = self.data.merged(eqList)
+        return True
 
     async def getNightMode(self):
-        response = await self._getCommand("getPersonalListeningMode")
+        response = await self._getCommand("getPersonalListeningMode", "night_mode")
+        if response is UNCHANGED:
+            return UNCHANGED
         if "status" in response:
+            self._builtFrom("night_mode", "getPersonalListeningMode")
             return { "NightMode": response["status"] }
         else:
             return {}
             
     async def setNightMode(self, value: bool):
+        self._commandSent("night_mode")
         # Disable SSL warnings
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
         """Fetch data from the API."""
-        url = f'https://{self.address}/httpapi.asp'
+        url = self.httpApiUrl
         headers = {
         'Accept-Encoding': "gzip",
         }
@@ -432,46 +1321,54 @@ class Coordinator(DataUpdateCoordinator):
         strvalue = 'on' if value else 'off'
         payload = 'command=setPersonalListeningMode&payload={"status":"'+strvalue+'"}'
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with asyncio.timeout(10):
-                    async with session.post(url, headers=headers, data=payload,  ssl=self.sslcontext) as response:
-                        if response.status != 200:
-                            _LOGGER.error("Failed to set Nightmode: %s", response.status)
-                            return {}
-                        else:
-                            return {}
-            except Exception as e:
-                _LOGGER.error("Error setting Nightmode: %s", str(e))
-                return {}
+        try:
+            status, _ = await self._request("POST", url, idempotent=False, headers=headers, data=payload)
+            if status != 200:
+                _LOGGER.error("Failed to set Nightmode: %s", status)
+                return False
+            else:
+                return True
+        except Exception as e:
+            _LOGGER.error("Error setting Nightmode: %s", str(e))
+            return False
 
     async def getRearSpeaker(self):
-        response = await self._getCommand("getRearSpeakerStatus")
+        response = await self._getCommand("getRearSpeakerStatus", "rears")
+        if response is UNCHANGED:
+            return UNCHANGED
         if "rears" in response:
+            self._builtFrom("rears", "getRearSpeakerStatus")
             return { "Rears": response["rears"] }
         else:
             return {}
     
     async def getSmartMode(self):
-        response = await self._getCommand("getSmartMode")
+        response = await self._getCommand("getSmartMode", "smart_mode")
+        if response is UNCHANGED:
+            return UNCHANGED
         if "status" in response:
+            self._builtFrom("smart_mode", "getSmartMode")
             return { "SmartMode": response["status"] }
         else:
             return {}
 
     async def getPureVoice(self):
-        response = await self._getCommand("getPureVoiceState")
+        response = await self._getCommand("getPureVoiceState", "pure_voice")
+        if response is UNCHANGED:
+            return UNCHANGED
         if "purevoice_state" in response:
+            self._builtFrom("pure_voice", "getPureVoiceState")
             return { "PureVoice": "on" if response["purevoice_state"] == "1" else "off" }
         else:
             return {}
             
     async def setPureVoice(self, value: bool):
+        self._commandSent("pure_voice")
         # Disable SSL warnings
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
         """Fetch data from the API."""
-        url = f'https://{self.address}/httpapi.asp'
+        url = self.httpApiUrl
         headers = {
         'Accept-Encoding': "gzip",
         }
@@ -479,95 +1376,83 @@ class Coordinator(DataUpdateCoordinator):
         strvalue = '1' if value else '0'
         payload = 'command=setPureVoiceState&payload={"purevoice_state":"'+strvalue+'"}'
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with asyncio.timeout(10):
-                    async with session.post(url, headers=headers, data=payload,  ssl=self.sslcontext) as response:
-                        if response.status != 200:
-                            _LOGGER.error("Failed to set PureVoice: %s", response.status)
-                            return {}
-                        else:
-                            return {}
-            except Exception as e:
-                _LOGGER.error("Error setting PureVoice: %s", str(e))
-                return {}
+        try:
+            status, _ = await self._request("POST", url, idempotent=False, headers=headers, data=payload)
+            if status != 200:
+                _LOGGER.error("Failed to set PureVoice: %s", status)
+                return False
+            else:
+                return True
+        except Exception as e:
+            _LOGGER.error("Error setting PureVoice: %s", str(e))
+            return False
 
     async def getEQPresets(self):
         """Fetch the list of EQ presets and the currently active one."""
         if not self.newFirmware:
             return {}
 
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        url = f'https://{self.address}/httpapi.asp?command=getEQList'
-        headers = {'Accept-Encoding': "gzip"}
+        response_json = await self._getCommand("getEQList", "eq_presets")
+        if response_json is UNCHANGED:
+            return UNCHANGED
+        if not response_json:
+            return {}
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with asyncio.timeout(10):
-                    async with session.get(url, headers=headers, ssl=self.sslcontext) as response:
-                        if response.status == 200:
-                            response_text = await response.text()
-                            response_json = json.loads(response_text)
-                            _LOGGER.debug("EQ Presets Response: %s", response_text)
-
-                            eq_list = response_json.get("eq_list", [])
-                            active_id = str(response_json.get("active_eq_id", "0"))
-
-                            preset_map = {}
-                            preset_data = {}
-                            active_name = None
-                            for item in eq_list:
-                                eq_id = str(item.get("eq_id", ""))
-                                eq_name = item.get("eq_name", f"Preset {eq_id}")
-                                preset_map[eq_id] = eq_name
-                                preset_data[eq_id] = item
-                                if eq_id == active_id:
-                                    active_name = eq_name
-
-                            if not active_name and preset_map:
-                                active_name = next(iter(preset_map.values()))
-
-                            return {
-                                "eq_preset_map": preset_map,
-                                "eq_preset_data": preset_data,
-                                "eq_active_preset": active_name,
-                                "eq_active_id": active_id,
-                            }
-                        else:
-                            _LOGGER.error("Failed to get EQ presets: %s", response.status)
-                            return {}
-            except Exception as e:
-                _LOGGER.warning("Error getting EQ presets: %s", str(e))
-                return {}
+        eq_list = response_json.get("eq_list", [])
+        active_id = str(response_json.get("active_eq_id", "0"))
+
+        preset_map = {}
+        preset_data = {}
+        active_name = None
+        for item in eq_list:
+            eq_id = str(item.get("eq_id", ""))
+            eq_name = item.get("eq_name", f"Preset {eq_id}")
+            preset_map[eq_id] = eq_name
+            # Payloads are shared between devices with the same preset.
+            preset_data[eq_id] = intern_preset(item)
+            if eq_id == active_id:
+                active_name = eq_name
+
+        if not active_name and preset_map:
+            active_name = next(iter(preset_map.values()))
+
+        self._builtFrom("eq_presets", "getEQList")
+        return {
+            "eq_preset_map": preset_map,
+            "eq_preset_data": preset_data,
+            "eq_active_preset": active_name,
+            "eq_active_id": active_id,
+        }
 
     async def setActiveEQPreset(self, eq_id: str):
         """Set the active EQ preset by its ID, sending full payload."""
+        self._commandSent("eq", "eq_presets")
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
         preset_data = self.data.get("eq_preset_data", {})
         preset = preset_data.get(eq_id)
         if not preset:
             _LOGGER.error("EQ preset data not found for id: %s", eq_id)
-            return
+            return False
 
         send_payload = json.dumps({
             "active_eq_id": eq_id,
-            "band": preset.get("band", 7),
-            "eq_payload": preset.get("eq_payload", {}),
+            "band": preset.band,
+            "eq_payload": preset.eq_payload,
         })
 
-        url = f'https://{self.address}/httpapi.asp'
+        url = self.httpApiUrl
         headers = {'Accept-Encoding': "gzip"}
         payload = f'command=setActiveEQ&payload={send_payload}'
         _LOGGER.debug("Setting EQ preset: %s", payload)
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with asyncio.timeout(10):
-                    async with session.post(url, headers=headers, data=payload, ssl=self.sslcontext) as response:
-                        if response.status != 200:
-                            _LOGGER.error("Failed to set EQ preset: %s", response.status)
-                        else:
-                            _LOGGER.debug("EQ preset set successfully to id: %s", eq_id)
-            except Exception as e:
-                _LOGGER.error("Error setting EQ preset: %s", str(e))
+        try:
+            status, _ = await self._request("POST", url, idempotent=False, headers=headers, data=payload)
+            if status != 200:
+                _LOGGER.error("Failed to set EQ preset: %s", status)
+                return False
+            _LOGGER.debug("EQ preset set successfully to id: %s", eq_id)
+            return True
+        except Exception as e:
+            _LOGGER.error("Error setting EQ preset: %s", str(e))
+            return False
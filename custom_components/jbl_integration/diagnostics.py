@@ -0,0 +1,27 @@
+"""Diagnostics support for the JBL integration."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {
+    CONF_ADDRESS, "mac", "MAC", "wlan0_mac", "apcli0", "uuid", "serial_number",
+    "ip", "ssid", "identifiers", "connections",
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "device": async_redact_data(coordinator._rawDeviceInfo, TO_REDACT),
+        "new_firmware": coordinator.newFirmware,
+        "health": coordinator.health,
+        "capabilities": coordinator.capabilities,
+        "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+        "last_update_success": coordinator.last_update_success,
+        "statistics": coordinator.stats.asDict(),
+    }
@@ -1,7 +1,10 @@
 """Shared entity helpers for the JBL integration."""
 
+from homeassistant.helpers.entity import Entity
 from homeassistant.util import slugify
 
+from .const import DOMAIN
+
 
 def entity_id_slug(value: str) -> str:
     """Return a Home Assistant-safe slug for manual entity IDs."""
@@ -10,4 +13,31 @@ def entity_id_slug(value: str) -> str:
 
 def build_entity_id(platform: str, *parts: str) -> str:
     """Build a sanitized entity ID from a platform and name parts."""
-    return f"{platform}.{ '_'.join(entity_id_slug(part) for part in parts if part) }"
\ No newline at end of file
+    return f"{platform}.{ '_'.join(entity_id_slug(part) for part in parts if part) }"
+
+
+def rear_speaker(data, number: int):
+    """Return the data of one rear speaker, or None while it is not reported."""
+    rears = (data or {}).get("Rears")
+    if not rears or number >= len(rears):
+        return None
+    return rears[number]
+
+
+def rear_device_info(device_info, channel: str):
+    """Return the device info of the rear speaker on the given channel."""
+    rearDevice = device_info.copy()
+    rearDevice["name"] = f"{device_info['name']} Rear Speaker {channel.title()}"
+    rearDevice["identifiers"] = {(DOMAIN, f"{device_info.get('name', 'jbl_integration').replace(' ', '_').lower()}_{channel}")}
+    return rearDevice
+
+
+class JBLEntity(Entity):
+    """Base of the entities showing soundbar coordinator data."""
+
+    _attr_should_poll = False
+
+    @property
+    def available(self):
+        """Return False while the soundbar is not responding."""
+        return self.coordinator.last_update_success
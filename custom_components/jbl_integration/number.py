@@ -1,188 +1,127 @@
 """Number platform for JBL integration."""
-import async_timeout
 import logging
-from homeassistant.components.number import NumberEntity
+from homeassistant.components.number import NumberEntity, NumberEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_track_state_change
 
 from .const import DOMAIN
 from .coordinator import Coordinator
-from .entity import build_entity_id
+from .entity import JBLEntity, build_entity_id
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def _eqBand(key, minValue, step):
+    # The key is the band's data key; the leading spaces of the lower bands
+    # are part of their unique and entity IDs.
+    return NumberEntityDescription(
+        key=key,
+        name=key.replace('_', ' '),
+        icon="mdi:equalizer",
+        native_min_value=minValue,
+        native_max_value=6,
+        native_step=step,
+        native_unit_of_measurement="db",
+    )
+
+
+NEW_FIRMWARE_EQ_BANDS = (
+    _eqBand(" 125Hz", -9, 0.5),
+    _eqBand(" 250Hz", -6, 0.5),
+    _eqBand(" 500Hz", -6, 0.5),
+    _eqBand("1000Hz", -6, 0.5),
+    _eqBand("2000Hz", -6, 0.5),
+    _eqBand("4000Hz", -6, 0.5),
+    _eqBand("8000Hz", -6, 0.5),
+)
+
+OLD_FIRMWARE_EQ_BANDS = (
+    _eqBand("EQ_1_Low", -9, 1),
+    _eqBand("EQ_2_Mid", -6, 1),
+    _eqBand("EQ_3_High", -6, 1),
+)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up the JBL switch platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
     entityArray = []
-    entityArray.append(JBLVolumeNumber(entry, coordinator))
-    if coordinator.newFirmware:
-        entityArray.append(JBLEqNumber(entry, coordinator," 125Hz"))
-        entityArray.append(JBLEqNumber(entry, coordinator," 250Hz"))
-        entityArray.append(JBLEqNumber(entry, coordinator," 500Hz"))
-        entityArray.append(JBLEqNumber(entry, coordinator,"1000Hz"))
-        entityArray.append(JBLEqNumber(entry, coordinator,"2000Hz"))
-        entityArray.append(JBLEqNumber(entry, coordinator,"4000Hz"))
-        entityArray.append(JBLEqNumber(entry, coordinator,"8000Hz"))
-    else:
-        entityArray.append(JBLEqNumber(entry, coordinator,"EQ_1_Low"))
-        entityArray.append(JBLEqNumber(entry, coordinator,"EQ_2_Mid"))
-        entityArray.append(JBLEqNumber(entry, coordinator,"EQ_3_High"))
-    
+    # Models without the UPnP volume control get no volume slider.
+    if coordinator.capabilities.get("volume") is not False:
+        entityArray.append(JBLVolumeNumber(entry, coordinator))
+    bands = NEW_FIRMWARE_EQ_BANDS if coordinator.newFirmware else OLD_FIRMWARE_EQ_BANDS
+    entityArray.extend(JBLEqNumber(entry, coordinator, description) for description in bands)
+
     async_add_entities(entityArray)
 
 
-class JBLVolumeNumber(NumberEntity):
-    """Representation of a switch to control JBL power."""
+class JBLVolumeNumber(JBLEntity, NumberEntity):
+    """Representation of a slider to control the JBL volume."""
+
+    _attr_name = "Volume"
+    _attr_native_min_value = 0
+    _attr_native_max_value = 100
+    _attr_native_step = 3
+    _attr_native_unit_of_measurement = "%"
 
     def __init__(self, entry: ConfigEntry, coordinator: Coordinator):
-        """Initialize the switch."""
-        self._entry = entry
-        self._value  = 0
+        """Initialize the slider."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"jbl_VolumeSlider_{entry.entry_id}"
+        self._attr_device_info = coordinator.device_info
         self.entity_id = build_entity_id(
             "number",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            self.name,
+            coordinator.device_info.get("name", "jbl_integration"),
+            self._attr_name,
         )
-        
-
-    @property
-    def name(self):
-        """Return the name of the Slider."""
-        return "Volume"
-
-    @property
-    def unique_id(self):
-        """Return a unique ID for the Slider."""
-        return f"jbl_VolumeSlider_{self._entry.entry_id}"
-        
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        return self.coordinator.device_info
-
-    @property
-    def native_min_value(self):
-        """Return the minimum value."""
-        return 0
-
-    @property
-    def native_max_value(self):
-        """Return the maximum value."""
-        return 100
-
-    @property
-    def native_step(self):
-        """Return the step size."""
-        return 3
 
     @property
     def native_value(self):
         """Return the current value."""
         return self.coordinator.data.get("volume_level")
 
-    @property
-    def native_unit_of_measurement(self):
-        """Return the unit of measurement."""
-        return "%"
-
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
-
-
     async def async_set_native_value(self, value: float):
-        await self.coordinator.setVolume(value)
-        await self.coordinator.async_request_refresh()
+        self.coordinator.queueVolume(value)
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+        self.async_on_remove(self.coordinator.async_add_key_listener(("volume_level",), self.async_write_ha_state))
 
     async def async_update(self):
         """Update the sensor."""
         await self.coordinator.async_request_refresh()
 
-class JBLEqNumber(NumberEntity):
+
+class JBLEqNumber(JBLEntity, NumberEntity):
     """Representation of a number to control the EQ."""
 
-    def __init__(self, entry: ConfigEntry, coordinator: Coordinator, eqLevel ):
+
+    def __init__(self, entry: ConfigEntry, coordinator: Coordinator, description: NumberEntityDescription):
         """Initialize the number."""
-        self._entry = entry
-        self._value  = 0        
-        self.entityName = eqLevel
         self.coordinator = coordinator
+        self.entity_description = description
+        self._band = description.key.strip()
+        self._attr_unique_id = f"jbl_{description.key.replace('_', '')}_{entry.entry_id}"
+        self._attr_device_info = coordinator.device_info
         self.entity_id = build_entity_id(
             "number",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            self.entityName,
+            coordinator.device_info.get("name", "jbl_integration"),
+            description.key,
         )
 
-    @property
-    def name(self):
-        """Return the name of the Slider."""
-        return self.entityName.replace('_',' ')
-
-    @property
-    def icon(self):
-        return "mdi:equalizer"
-
-    @property
-    def unique_id(self):
-        """Return a unique ID for the Slider."""
-        return f"jbl_{self.entityName.replace('_','')}_{self._entry.entry_id}"
-        
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        
-        return self.coordinator.device_info
-
-
-    @property
-    def native_min_value(self):
-        """Return the minimum value."""
-        minValue = -6 if ("EQ_1_Low" != self.entityName and " 125Hz" != self.entityName) else -9
-        return minValue
-
-    @property
-    def native_max_value(self):
-        """Return the maximum value."""
-        return 6
-
-    @property
-    def native_step(self):
-        """Return the step size."""
-        return 0.5 if self.coordinator.newFirmware else 1
-
     @property
     def native_value(self):
         """Return the current value."""
-        return self.coordinator.data.get(self.entityName.strip())
-
-    @property
-    def native_unit_of_measurement(self):
-        """Return the unit of measurement."""
-        return "db"
-
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
+        return self.coordinator.data.get(self._band)
 
     async def async_set_native_value(self, value: float):
-        await self.coordinator.setEQ(value,self.entityName.strip())
-        await self.coordinator.async_request_refresh()
+        self.coordinator.queueEQ(value, self._band)
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+        self.async_on_remove(self.coordinator.async_add_key_listener((self._band,), self.async_write_ha_state))
 
     async def async_update(self):
         """Update the sensor."""
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+        await self.coordinator.async_request_refresh()
@@ -0,0 +1,59 @@
+"""Timeout, retry and deadline policy for requests to the soundbar."""
+import random
+
+import aiohttp
+
+from .const import (
+    CONF_CONNECT_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    CONF_READ_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    CONF_READ_RETRIES,
+    DEFAULT_READ_RETRIES,
+    CONF_CYCLE_DEADLINE,
+    DEFAULT_CYCLE_DEADLINE,
+    RETRY_BACKOFF,
+)
+
+# Answers worth retrying: the soundbar's web server is briefly overloaded.
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class RequestPolicy:
+    """How long one request may take, how often reads are retried, and the
+    deadline of a whole poll cycle.
+
+    Only idempotent reads are retried. Writes and key presses are sent once:
+    a retried volume step or power toggle could be applied twice.
+    """
+
+    def __init__(self, connectTimeout=DEFAULT_CONNECT_TIMEOUT, readTimeout=DEFAULT_READ_TIMEOUT, retries=DEFAULT_READ_RETRIES, cycleDeadline=DEFAULT_CYCLE_DEADLINE):
+        self.connectTimeout = connectTimeout
+        self.readTimeout = readTimeout
+        self.retries = retries
+        self.cycleDeadline = cycleDeadline
+        self.timeout = aiohttp.ClientTimeout(
+            total=connectTimeout + readTimeout,
+            sock_connect=connectTimeout,
+            sock_read=readTimeout,
+        )
+
+    @classmethod
+    def fromOptions(cls, options):
+        return cls(
+            float(options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)),
+            float(options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT)),
+            int(options.get(CONF_READ_RETRIES, DEFAULT_READ_RETRIES)),
+            float(options.get(CONF_CYCLE_DEADLINE, DEFAULT_CYCLE_DEADLINE)),
+        )
+
+    def attempts(self, idempotent):
+        return 1 + self.retries if idempotent else 1
+
+    def retryDelay(self, attempt):
+        """Return the wait before retry number attempt (0-based).
+
+        Full jitter keeps several soundbars that failed together from
+        retrying in lockstep.
+        """
+        return random.uniform(0, RETRY_BACKOFF * 2 ** attempt)
@@ -0,0 +1,51 @@
+"""Poll scheduling shared by all JBL soundbars."""
+import asyncio
+import random
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, MAX_GLOBAL_REQUESTS, SCHEDULE_JITTER
+
+DATA_SCHEDULER = "scheduler"
+
+
+class PollScheduler:
+    """Spread the poll cycles of all soundbars and cap their requests in flight.
+
+    Every registered coordinator owns an evenly spaced slot within its poll
+    interval, so devices added together (e.g. after a restart) stop polling
+    in phase. The global semaphore hands out request slots first come, first
+    served; with each device also limited to its own concurrency, no single
+    soundbar can take all of them.
+    """
+
+    def __init__(self, maxInFlight=MAX_GLOBAL_REQUESTS):
+        self._semaphore = asyncio.Semaphore(maxInFlight)
+        self._members = []
+
+    def register(self, coordinator):
+        self._members.append(coordinator)
+
+    def unregister(self, coordinator):
+        if coordinator in self._members:
+            self._members.remove(coordinator)
+
+    def nextPoll(self, coordinator, earliest, interval):
+        """Return the first time at or after earliest on the coordinator's slot."""
+        count = max(1, len(self._members))
+        index = self._members.index(coordinator) if coordinator in self._members else 0
+        slotWidth = interval / count
+        phase = index * slotWidth + random.uniform(0, SCHEDULE_JITTER * slotWidth)
+        return earliest + (phase - earliest) % interval
+
+    def request(self):
+        """Return the context manager holding one global request slot."""
+        return self._semaphore
+
+
+def async_get_scheduler(hass: HomeAssistant):
+    """Return the scheduler shared by all entries, creating it on first use."""
+    domainData = hass.data.setdefault(DOMAIN, {})
+    if DATA_SCHEDULER not in domainData:
+        domainData[DATA_SCHEDULER] = PollScheduler()
+    return domainData[DATA_SCHEDULER]
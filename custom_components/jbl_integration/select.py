@@ -1,5 +1,4 @@
 """Select platform for JBL integration."""
-import asyncio
 import logging
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
@@ -7,7 +6,7 @@ from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
 from .coordinator import Coordinator
-from .entity import build_entity_id
+from .entity import JBLEntity, build_entity_id
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,39 +22,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     async_add_entities(entities)
 
 
-class JBLEQPresetSelect(SelectEntity):
+class JBLEQPresetSelect(JBLEntity, SelectEntity):
     """Select entity for JBL EQ presets."""
 
+    _attr_name = "JBL EQ Preset"
+    _attr_icon = "mdi:tune-variant"
+
     def __init__(self, entry: ConfigEntry, coordinator: Coordinator):
         """Initialize the select."""
-        self._entry = entry
         self.coordinator = coordinator
+        self._attr_unique_id = f"jbl_eq_preset_{entry.entry_id}"
+        self._attr_device_info = coordinator.device_info
         self.entity_id = build_entity_id(
             "select",
-            self.coordinator.device_info.get("name", "jbl_integration"),
+            coordinator.device_info.get("name", "jbl_integration"),
             "eq_preset",
         )
 
-    @property
-    def name(self):
-        """Return the name of the select."""
-        return "JBL EQ Preset"
-
-    @property
-    def unique_id(self):
-        """Return a unique ID for the select."""
-        return f"jbl_eq_preset_{self._entry.entry_id}"
-
-    @property
-    def icon(self):
-        """Return the icon."""
-        return "mdi:tune-variant"
-
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        return self.coordinator.device_info
-
     @property
     def options(self):
         """Return the list of available EQ preset names."""
@@ -72,25 +55,13 @@ class JBLEQPresetSelect(SelectEntity):
         preset_map = self.coordinator.data.get("eq_preset_map", {})
         for eq_id, eq_name in preset_map.items():
             if eq_name == option:
-                await self.coordinator.setActiveEQPreset(eq_id)
-                # Optimistic update
-                self.coordinator.data["eq_active_preset"] = eq_name
-                self.coordinator.data["eq_active_id"] = eq_id
-                self.async_write_ha_state()
-                # Delay then refresh to confirm
-                await asyncio.sleep(1)
-                await self.coordinator.async_request_refresh()
+                self.coordinator.queueEQPreset(eq_id)
                 return
         _LOGGER.error("EQ preset not found: %s", option)
 
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+        self.async_on_remove(self.coordinator.async_add_key_listener(("eq_preset_map", "eq_active_preset"), self.async_write_ha_state))
 
     async def async_update(self):
         """Update the entity."""
@@ -1,182 +1,243 @@
 """Sensor platform for JBL integration."""
-import aiohttp
-import async_timeout
-import logging
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import timedelta
-from homeassistant.helpers.entity import Entity
+import logging
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.const import PERCENTAGE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
+from homeassistant.helpers.event import async_track_time_interval
 
-from .const import DOMAIN
+from .const import DOMAIN, STATS_UPDATE_INTERVAL
 from .coordinator import Coordinator
-from .entity import build_entity_id
+from .entity import JBLEntity, build_entity_id, rear_device_info, rear_speaker
+from .stats import DeviceStats
 
 _LOGGER = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True, kw_only=True)
+class JBLSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor showing one coordinator data key."""
+
+    entity_registry_enabled_default: bool = False
+
+
+@dataclass(frozen=True, kw_only=True)
+class JBLRearSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of a rear speaker."""
+
+    value_fn: Callable[[dict], Any]
+
+
+@dataclass(frozen=True, kw_only=True)
+class JBLStatsSensorEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor of the coordinator's request statistics."""
+
+    value_fn: Callable[[DeviceStats], Any]
+    attributes_fn: Callable[[DeviceStats], dict] | None = None
+    entity_category: EntityCategory = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+
+
+INFO_SENSORS = (
+    JBLSensorEntityDescription(key="play_medium", name="Play Medium", icon="mdi:soundbar"),
+    JBLSensorEntityDescription(key="volume_level", name="Volume", icon="mdi:volume-high"),
+    JBLSensorEntityDescription(key="transport_state", name="Transport State", icon="mdi:state-machine"),
+    JBLSensorEntityDescription(key="transport_status", name="Transport Status", icon="mdi:information"),
+    JBLSensorEntityDescription(key="mute", name="mute", icon="mdi:volume-mute"),
+    JBLSensorEntityDescription(key="track_duration", name="Track Duration", icon="mdi:information"),
+    JBLSensorEntityDescription(key="track", name="Track", icon="mdi:information"),
+    JBLSensorEntityDescription(key="channel", name="Channel", icon="mdi:information"),
+)
+
+REAR_SENSORS = (
+    JBLRearSensorEntityDescription(
+        key="battery",
+        name="Battery",
+        device_class=SensorDeviceClass.BATTERY,
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda rear: rear["capicity"],
+    ),
+)
+
+STATS_SENSORS = (
+    JBLStatsSensorEntityDescription(
+        key="poll_cycle_time",
+        name="Poll Cycle Time",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda stats: stats.cycles.percentile(0.5),
+        attributes_fn=lambda stats: stats.cycles.asDict(),
+    ),
+    JBLStatsSensorEntityDescription(
+        key="request_latency",
+        name="Request Latency",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        # The slowest request kind's p95; diagnostics break it down per request.
+        value_fn=lambda stats: max((request.percentile(0.95) for request in stats.requests.values() if request.latencies), default=None),
+    ),
+    JBLStatsSensorEntityDescription(
+        key="request_failures",
+        name="Request Failures",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.failures,
+    ),
+    JBLStatsSensorEntityDescription(
+        key="request_timeouts",
+        name="Request Timeouts",
+        icon="mdi:timer-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.timeouts,
+    ),
+    JBLStatsSensorEntityDescription(
+        key="cycle_overruns",
+        name="Poll Cycle Overruns",
+        icon="mdi:timer-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.overruns,
+        attributes_fn=lambda stats: {"deadline_misses": stats.deadlineMisses},
+    ),
+)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up the JBL sensor platform."""
 
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    
-    entityArray = []
-    entityArray.append(JBLSensor(coordinator,entry,"play_medium","Play Medium","mdi:soundbar"))
-    entityArray.append(JBLSensor(coordinator,entry,"volume_level","Volume","mdi:volume-high"))
-    entityArray.append(JBLSensor(coordinator,entry,"transport_state","Transport State","mdi:state-machine"))
-    entityArray.append(JBLSensor(coordinator,entry,"transport_status","Transport Status","mdi:information"))
-    entityArray.append(JBLSensor(coordinator,entry,"mute","mute","mdi:volume-mute"))
-    entityArray.append(JBLSensor(coordinator,entry,"track_duration","Track Duration","mdi:information"))
-    entityArray.append(JBLSensor(coordinator,entry,"track","Track","mdi:information"))
-    entityArray.append(JBLSensor(coordinator,entry,"channel","Channel","mdi:information"))
-    
-    if "Rears" in coordinator.data:
-        entityArray.append(JBLRearSensor(coordinator,entry,0))
-        entityArray.append(JBLRearSensor(coordinator,entry,1))
-        
+
+    entityArray = [JBLSensor(coordinator, entry, description) for description in INFO_SENSORS]
+    entityArray.extend(JBLStatsSensor(coordinator, entry, description) for description in STATS_SENSORS)
+    for number, rear in enumerate((coordinator.data.get("Rears") or [])[:2]):
+        entityArray.extend(JBLRearSensor(coordinator, entry, number, rear["channel"], description) for description in REAR_SENSORS)
+
     async_add_entities(entityArray)
 
-    
-class JBLSensor(Entity):
-    """Representation of a sensor to get JBL PlayMedium."""
 
-    def __init__(self, coordinator, entry, infoString, name, icon):
+class JBLSensor(JBLEntity, SensorEntity):
+    """Representation of a sensor showing one value of the soundbar."""
+
+    entity_description: JBLSensorEntityDescription
+
+    def __init__(self, coordinator: Coordinator, entry: ConfigEntry, description: JBLSensorEntityDescription):
         """Initialize the sensor."""
         self.coordinator = coordinator
-        self._entry = entry
-        self.entityName = name
-        self.entityicon = icon
+        self.entity_description = description
+        self._attr_unique_id = f"jbl_800_{description.key.replace('_', '')}_{entry.entry_id}"
+        self._attr_device_info = coordinator.device_info
         self.entity_id = build_entity_id(
             "sensor",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            self.entityName,
+            coordinator.device_info.get("name", "jbl_integration"),
+            description.name,
         )
-        self.infoString = infoString
 
     @property
-    def name(self):
-        """Return the name of the sensor."""
-        return self.entityName
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.coordinator.data.get(self.entity_description.key)
 
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        """Return whether the entity should be enabled when first added to the entity registry."""
-        return False  # Disable the sensor by default
+    async def async_added_to_hass(self):
+        """When entity is added to hass."""
+        self.async_on_remove(self.coordinator.async_add_key_listener((self.entity_description.key,), self.async_write_ha_state))
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self.coordinator.data.get(self.infoString)
+    async def async_update(self):
+        """Update the sensor."""
+        await self.coordinator.async_request_refresh()
 
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend."""
-        return self.entityicon
 
-    @property
-    def enabled(self):
-        return False
+class JBLRearSensor(JBLEntity, SensorEntity):
+    """Representation of a sensor of one rear speaker of the JBL."""
 
-    @property
-    def unique_id(self):
-        """Return a unique ID for the sensor."""
-        return f"jbl_800_{self.infoString.replace('_', '')}_{self._entry.entry_id}"
+    entity_description: JBLRearSensorEntityDescription
 
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
+    def __init__(self, coordinator: Coordinator, entry: ConfigEntry, number: int, channel: str, description: JBLRearSensorEntityDescription):
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self.number = number
+        self.entity_description = description
+        self._attr_unique_id = f"jbl_{entry.entry_id}_{channel.lower()}_{description.name.replace(' ', '_').lower()}"
+        self._attr_device_info = rear_device_info(coordinator.device_info, channel)
+        self.entity_id = build_entity_id(
+            "sensor",
+            coordinator.device_info.get("name", "jbl_integration"),
+            channel,
+            description.name,
+        )
 
     @property
-    def device_info(self):
-        """Return device information about this entity."""
-        return self.coordinator.device_info
+    def available(self):
+        """Return False while the soundbar does not report this rear speaker."""
+        return super().available and rear_speaker(self.coordinator.data, self.number) is not None
 
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        rear = rear_speaker(self.coordinator.data, self.number)
+        return self.entity_description.value_fn(rear) if rear is not None else None
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+        self.async_on_remove(self.coordinator.async_add_key_listener(("Rears",), self.async_write_ha_state))
 
     async def async_update(self):
         """Update the sensor."""
         await self.coordinator.async_request_refresh()
 
-class JBLRearSensor(Entity):
-    """Representation of a battery for the rear speakers of the  JBL."""
 
-    def __init__(self, coordinator, entry, arrayNumber: int):
+class JBLStatsSensor(JBLEntity, SensorEntity):
+    """Diagnostic sensor of the request statistics of the soundbar."""
+
+    entity_description: JBLStatsSensorEntityDescription
+
+    def __init__(self, coordinator: Coordinator, entry: ConfigEntry, description: JBLStatsSensorEntityDescription):
         """Initialize the sensor."""
         self.coordinator = coordinator
-        self.number = arrayNumber
-        self._entry = entry
-        self.entityName = "Battery"
+        self.entity_description = description
+        self._attr_unique_id = f"jbl_{entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
         self.entity_id = build_entity_id(
             "sensor",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            self.coordinator.data["Rears"][self.number]["channel"],
-            self.entityName,
+            coordinator.device_info.get("name", "jbl_integration"),
+            description.name,
         )
 
     @property
-    def name(self):
-        """Return the name of the sensor."""
-        return self.entityName
-    
-    @property
-    def device_class(self):
-        return SensorDeviceClass.BATTERY
-
-    @property
-    def unit_of_measurement(self):
-        return PERCENTAGE
-
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        """Return whether the entity should be enabled when first added to the entity registry."""
-        return True  # Disable the sensor by default
-
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if "Rears" in self.coordinator.data:
-            return self.coordinator.data["Rears"][self.number]["capicity"]
-        else:
-            _LOGGER.debug("Rear speaker unavailable for %s", self.entity_id )
-            return None
-            
-
-    @property
-    def enabled(self):
+    def available(self):
+        """Statistics stay readable while the soundbar is unreachable."""
         return True
 
     @property
-    def unique_id(self):
-        """Return a unique ID for the sensor."""
-        return f"jbl_{self._entry.entry_id}_{self.coordinator.data["Rears"][self.number]["channel"].lower()}_{self.entityName.replace(' ', '_').lower()}"
-
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator.stats)
 
     @property
-    def device_info(self):
-        """Return device information about this entity."""
-        BaseDevice = self.coordinator.device_info.copy()
-        BaseDevice["name"] = BaseDevice["name"] + " Rear Speaker " + self.coordinator.data["Rears"][self.number]["channel"].title()
-        BaseDevice["identifiers"] = {(DOMAIN,f"{self.coordinator.device_info.get("name", "jbl_integration").replace(' ', '_').lower()}_{self.coordinator.data["Rears"][self.number]["channel"]}")}
-        return BaseDevice
+    def extra_state_attributes(self):
+        """Return the detailed statistics."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator.stats)
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+        # Statistics change with every request; publishing them at a fixed
+        # pace keeps them from flooding the recorder.
+        self.async_on_remove(async_track_time_interval(self.hass, self._async_publish, timedelta(seconds=STATS_UPDATE_INTERVAL)))
 
-    async def async_update(self):
-        """Update the sensor."""
-        await self.coordinator.async_request_refresh()
+    @callback
+    def _async_publish(self, now):
+        self.async_write_ha_state()
@@ -0,0 +1,83 @@
+"""Services of the JBL integration."""
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_EQ = "set_eq"
+
+# Service field -> coordinator data key of the band.
+NEW_FIRMWARE_BANDS = {
+    "band_125hz": "125Hz",
+    "band_250hz": "250Hz",
+    "band_500hz": "500Hz",
+    "band_1000hz": "1000Hz",
+    "band_2000hz": "2000Hz",
+    "band_4000hz": "4000Hz",
+    "band_8000hz": "8000Hz",
+}
+OLD_FIRMWARE_BANDS = {
+    "low": "EQ_1_Low",
+    "mid": "EQ_2_Mid",
+    "high": "EQ_3_High",
+}
+# Gain steps in dB the firmware accepts, as on the EQ number entities.
+NEW_FIRMWARE_STEP = 0.5
+OLD_FIRMWARE_STEP = 1
+
+LOW_GAIN = vol.All(vol.Coerce(float), vol.Range(min=-9, max=6))
+GAIN = vol.All(vol.Coerce(float), vol.Range(min=-6, max=6))
+
+SET_EQ_SCHEMA = vol.Schema(
+    {
+        vol.Required("device_id"): vol.All(cv.ensure_list, [cv.string]),
+        **{
+            vol.Optional(field): LOW_GAIN if field in ("band_125hz", "low") else GAIN
+            for field in (*NEW_FIRMWARE_BANDS, *OLD_FIRMWARE_BANDS)
+        },
+    }
+)
+
+
+def _coordinatorForDevice(hass: HomeAssistant, deviceId):
+    device = dr.async_get(hass).async_get(deviceId)
+    if device is not None:
+        for entryId in device.config_entries:
+            entryData = hass.data.get(DOMAIN, {}).get(entryId)
+            if entryData is not None:
+                return entryData["coordinator"]
+    raise ServiceValidationError(f"{deviceId} is not a loaded JBL soundbar")
+
+
+async def _async_set_eq(hass: HomeAssistant, call: ServiceCall):
+    """Write all given bands of each soundbar in one request."""
+    for deviceId in call.data["device_id"]:
+        coordinator = _coordinatorForDevice(hass, deviceId)
+        fields, step = (NEW_FIRMWARE_BANDS, NEW_FIRMWARE_STEP) if coordinator.newFirmware else (OLD_FIRMWARE_BANDS, OLD_FIRMWARE_STEP)
+        unsupported = [field for field in (*NEW_FIRMWARE_BANDS, *OLD_FIRMWARE_BANDS) if field in call.data and field not in fields]
+        if unsupported:
+            raise ServiceValidationError(f"{coordinator.device_info.get('name', deviceId)} has no EQ band {', '.join(unsupported)}")
+        # Round to the firmware's step, e.g. whole dB on older firmware.
+        bands = {band: float(round(call.data[field] / step) * step) for field, band in fields.items() if field in call.data}
+        if not bands:
+            continue
+        if not await coordinator.setEQBands(bands):
+            raise HomeAssistantError(f"Could not set the EQ of {coordinator.device_info.get('name', deviceId)}")
+        await coordinator.async_refresh_stale()
+
+
+def async_setup_services(hass: HomeAssistant):
+    """Register the integration services."""
+
+    async def async_set_eq(call: ServiceCall):
+        await _async_set_eq(hass, call)
+
+    hass.services.async_register(DOMAIN, SERVICE_SET_EQ, async_set_eq, schema=SET_EQ_SCHEMA)
@@ -0,0 +1,89 @@
+"""Decoders for the soundbar's UPnP SOAP responses."""
+import json
+import logging
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+_LOGGER = logging.getLogger(__name__)
+
+# UPnP error codes of an action the device does not implement.
+UNSUPPORTED_ACTION_CODES = ("401", "602")
+
+# GetInfoExResponse element -> coordinator data key.
+INFO_EX_FIELDS = {
+    "PlayMedium": "play_medium",
+    "CurrentVolume": "volume_level",
+    "TrackURI": "track",
+    "CurrentTransportState": "transport_state",
+    "CurrentTransportStatus": "transport_status",
+    "TrackDuration": "track_duration",
+    "CurrentMute": "mute",
+    "CurrentChannel": "channel",
+    "SlaveFlag": "slaves",
+}
+
+
+def _extract(text, fields):
+    """Collect the text of the wanted response elements in one streaming pass.
+
+    Response arguments are unqualified child elements, so matching on the bare
+    tag is enough. Elements missing from the response are simply left out.
+    """
+    parser = XMLPullParser(("end",))
+    parser.feed(text)
+    parser.close()
+    values = {}
+    for _, element in parser.read_events():
+        key = fields.get(element.tag)
+        if key is not None:
+            values[key] = element.text
+        element.clear()
+    return values
+
+
+def parse_info_ex(text):
+    """Return coordinator data from a GetInfoEx response.
+
+    Missing fields are skipped individually so one absent element no longer
+    discards the rest of the response.
+    """
+    try:
+        values = _extract(text, INFO_EX_FIELDS)
+    except ParseError as e:
+        _LOGGER.error("Could not parse GetInfoEx response: %s", str(e))
+        return {}
+    if len(values) < len(INFO_EX_FIELDS):
+        _LOGGER.debug("GetInfoEx response without %s", ", ".join(key for key in INFO_EX_FIELDS.values() if key not in values))
+    return values
+
+
+def has_element(text, tag):
+    """Return whether a SOAP response contains the unqualified element tag."""
+    try:
+        return tag in _extract(text, {tag: tag})
+    except ParseError:
+        return False
+
+
+def is_unsupported_action(text):
+    """Return whether a SOAP fault says the action is not implemented."""
+    fields = {"errorCode": "code", "{urn:schemas-upnp-org:control-1-0}errorCode": "code"}
+    try:
+        return _extract(text, fields).get("code") in UNSUPPORTED_ACTION_CODES
+    except ParseError:
+        return False
+
+
+def parse_control_device_info(text):
+    """Return the JSON Status payload of a GetControlDeviceInfo response."""
+    try:
+        status = _extract(text, {"Status": "status"}).get("status")
+    except ParseError as e:
+        _LOGGER.error("Could not parse GetControlDeviceInfo response: %s", str(e))
+        return {}
+    if not status:
+        return {}
+    try:
+        return json.loads(status)
+    except ValueError as e:
+        _LOGGER.error("Invalid GetControlDeviceInfo status: %s", str(e))
+        return {}
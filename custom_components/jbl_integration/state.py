@@ -0,0 +1,159 @@
+"""Compact, fixed-field state of one soundbar."""
+from collections.abc import Mapping
+import json
+import weakref
+
+# Coordinator data key -> SoundbarState slot. Keys the coordinator does not
+# know are dropped, so fields of earlier responses cannot pile up.
+FIELDS = {
+    # GetInfoEx and UPnP events
+    "play_medium": "play_medium",
+    "volume_level": "volume_level",
+    "track": "track",
+    "transport_state": "transport_state",
+    "transport_status": "transport_status",
+    "track_duration": "track_duration",
+    "mute": "mute",
+    "channel": "channel",
+    "slaves": "slaves",
+    # EQ bands, new and old firmware
+    "125Hz": "eq_125",
+    "250Hz": "eq_250",
+    "500Hz": "eq_500",
+    "1000Hz": "eq_1000",
+    "2000Hz": "eq_2000",
+    "4000Hz": "eq_4000",
+    "8000Hz": "eq_8000",
+    "EQ_1_Low": "eq_low",
+    "EQ_2_Mid": "eq_mid",
+    "EQ_3_High": "eq_high",
+    # EQ presets
+    "eq_preset_map": "eq_preset_map",
+    "eq_preset_data": "eq_preset_data",
+    "eq_active_preset": "eq_active_preset",
+    "eq_active_id": "eq_active_id",
+    # Modes and rear speakers
+    "NightMode": "night_mode",
+    "SmartMode": "smart_mode",
+    "PureVoice": "pure_voice",
+    "Rears": "rears",
+}
+
+_UNSET = object()
+
+# Canonical payload -> preset; soundbars of one model share their factory
+# presets, and a preset is dropped once no device holds it any more.
+_presets = weakref.WeakValueDictionary()
+
+
+class EQPreset:
+    """The part of a getEQList item sent back to activate the preset.
+
+    Instances are shared between devices and must not be modified.
+    """
+
+    __slots__ = ("band", "eq_payload", "_key", "__weakref__")
+
+    def __init__(self, band, eq_payload, key):
+        self.band = band
+        self.eq_payload = eq_payload
+        self._key = key
+
+    def get(self, name, default=None):
+        return getattr(self, name, default) if name in ("band", "eq_payload") else default
+
+    def asDict(self):
+        return {"band": self.band, "eq_payload": self.eq_payload}
+
+    def __eq__(self, other):
+        return isinstance(other, EQPreset) and other._key == self._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+
+def intern_preset(item):
+    """Return the shared preset for a getEQList item or cached preset dict."""
+    if isinstance(item, EQPreset):
+        return item
+    band = item.get("band", 7)
+    eq_payload = item.get("eq_payload", {})
+    key = json.dumps([band, eq_payload], sort_keys=True, separators=(",", ":"))
+    preset = _presets.get(key)
+    if preset is None:
+        preset = EQPreset(band, eq_payload, key)
+        _presets[key] = preset
+    return preset
+
+
+class SoundbarState(Mapping):
+    """Read-only mapping of the coordinator data keys to the last known values.
+
+    Updates never modify a state in place; merged() returns a new one, so
+    the state listeners were last notified about can be diffed against.
+    """
+
+    __slots__ = tuple(FIELDS.values())
+
+    def __init__(self, values=None):
+        for slot in self.__slots__:
+            object.__setattr__(self, slot, _UNSET)
+        if values:
+            self._apply(values)
+
+    def _apply(self, values):
+        for key, value in values.items():
+            slot = FIELDS.get(key)
+            if slot is None:
+                continue
+            if slot == "eq_preset_data" and value is not None:
+                value = {eq_id: intern_preset(item) for eq_id, item in value.items()}
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SoundbarState is read-only, use merged()")
+
+    def merged(self, *updates):
+        """Return a copy with the values of updates applied in order."""
+        state = SoundbarState.__new__(SoundbarState)
+        for slot in self.__slots__:
+            object.__setattr__(state, slot, getattr(self, slot))
+        for values in updates:
+            if values:
+                state._apply(values)
+        return state
+
+    def changedKeys(self, other):
+        """Return the data keys whose values differ from other's."""
+        return [
+            key for key, slot in FIELDS.items()
+            if getattr(self, slot) != getattr(other, slot)
+        ]
+
+    def asDict(self):
+        """Return plain, JSON-serialisable data, e.g. for the cache."""
+        data = dict(self)
+        presets = data.get("eq_preset_data")
+        if presets:
+            data["eq_preset_data"] = {eq_id: preset.asDict() for eq_id, preset in presets.items()}
+        return data
+
+    def __getitem__(self, key):
+        slot = FIELDS.get(key)
+        if slot is None:
+            raise KeyError(key)
+        value = getattr(self, slot)
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        for key, slot in FIELDS.items():
+            if getattr(self, slot) is not _UNSET:
+                yield key
+
+    def __len__(self):
+        return sum(1 for slot in self.__slots__ if getattr(self, slot) is not _UNSET)
+
+    def __repr__(self):
+        return f"SoundbarState({dict(self)!r})"
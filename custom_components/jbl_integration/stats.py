@@ -0,0 +1,104 @@
+"""Request latency and error statistics of a soundbar."""
+from array import array
+
+# Latency samples kept per request kind for the percentiles.
+LATENCY_SAMPLES = 200
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_FAILURE = "failure"
+OUTCOME_TIMEOUT = "timeout"
+
+
+def requestName(url, headers=None, data=None):
+    """Return a short name for a device request: its SOAP action or API command."""
+    action = (headers or {}).get("Soapaction")
+    if action:
+        return action.strip('"').rsplit("#", 1)[-1]
+    for text in (url.partition("?")[2], data if isinstance(data, str) else ""):
+        if text.startswith("command="):
+            return text[len("command="):].partition("&")[0]
+    return url.rsplit("/", 1)[-1]
+
+
+class LatencyStats:
+    """Recent latencies and outcome counters of one kind of request."""
+
+    __slots__ = ("latencies", "_next", "successes", "failures", "timeouts")
+
+    def __init__(self):
+        # Ring buffer of 4-byte floats; a deque of float objects takes eight
+        # times the memory once full.
+        self.latencies = array("f")
+        self._next = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+
+    def record(self, seconds, outcome=OUTCOME_SUCCESS):
+        if len(self.latencies) < LATENCY_SAMPLES:
+            self.latencies.append(seconds)
+        else:
+            self.latencies[self._next] = seconds
+            self._next = (self._next + 1) % LATENCY_SAMPLES
+        if outcome == OUTCOME_SUCCESS:
+            self.successes += 1
+        elif outcome == OUTCOME_TIMEOUT:
+            self.timeouts += 1
+        else:
+            self.failures += 1
+
+    def percentile(self, fraction):
+        """Return the given percentile of the recent latencies in ms, or None."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return round(ordered[round(fraction * (len(ordered) - 1))] * 1000, 1)
+
+    def asDict(self):
+        return {
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": self.percentile(1),
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+        }
+
+
+class DeviceStats:
+    """Per-request and per-cycle statistics of one coordinator."""
+
+    def __init__(self):
+        self.requests = {}
+        self.cycles = LatencyStats()
+        # Cycles that took longer than the scan interval, and cycles cut
+        # short by the request policy's deadline.
+        self.overruns = 0
+        self.deadlineMisses = 0
+
+    def recordRequest(self, name, seconds, outcome):
+        stats = self.requests.get(name)
+        if stats is None:
+            stats = self.requests[name] = LatencyStats()
+        stats.record(seconds, outcome)
+
+    def recordCycle(self, seconds, interval):
+        self.cycles.record(seconds)
+        if interval and seconds > interval:
+            self.overruns += 1
+
+    @property
+    def failures(self):
+        return sum(stats.failures for stats in self.requests.values())
+
+    @property
+    def timeouts(self):
+        return sum(stats.timeouts for stats in self.requests.values())
+
+    def asDict(self):
+        return {
+            "cycles": self.cycles.asDict(),
+            "overruns": self.overruns,
+            "deadline_misses": self.deadlineMisses,
+            "requests": {name: stats.asDict() for name, stats in sorted(self.requests.items())},
+        }
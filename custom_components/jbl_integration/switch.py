@@ -1,288 +1,145 @@
 """Switch platform for JBL integration."""
-import async_timeout
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
-from homeassistant.components.switch import SwitchEntity
+from typing import Any
+
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
 from .coordinator import Coordinator
-from .entity import build_entity_id
+from .entity import JBLEntity, build_entity_id
 
 _LOGGER = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True, kw_only=True)
+class JBLModeSwitchEntityDescription(SwitchEntityDescription):
+    """Describes a switch for an on/off sound mode."""
+
+    data_key: str
+    entity_suffix: str
+    set_fn: Callable[[Coordinator, bool], Any]
+
+
+MODE_SWITCHES = (
+    JBLModeSwitchEntityDescription(
+        key="smart_mode",
+        name="JBL Smart Mode",
+        icon="mdi:surround-sound",
+        data_key="SmartMode",
+        entity_suffix="smart_mode",
+        set_fn=lambda coordinator, value: coordinator.queueSmartMode(value),
+    ),
+    JBLModeSwitchEntityDescription(
+        key="night_mode",
+        name="JBL Night Mode",
+        icon="mdi:waveform",
+        data_key="NightMode",
+        entity_suffix="NightMode",
+        set_fn=lambda coordinator, value: coordinator.queueNightMode(value),
+    ),
+    JBLModeSwitchEntityDescription(
+        key="pure_voice",
+        name="JBL Pure Voice",
+        icon="mdi:account-voice",
+        data_key="PureVoice",
+        entity_suffix="pure_voice",
+        set_fn=lambda coordinator, value: coordinator.queuePureVoice(value),
+    ),
+)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up the JBL switch platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
-    entityArray = []
-    entityArray.append(JBLPowerSwitch(entry, coordinator))
-    if "SmartMode" in coordinator.data:
-        entityArray.append(SmartModeSwitch(entry, coordinator))
-    if "NightMode" in coordinator.data:
-        entityArray.append(NightModeSwitch(entry, coordinator))
-    if "PureVoice" in coordinator.data:
-        entityArray.append(PureVoiceModeSwitch(entry, coordinator))    
+    entityArray = [JBLPowerSwitch(entry, coordinator)]
+    entityArray.extend(
+        JBLModeSwitch(entry, coordinator, description)
+        for description in MODE_SWITCHES
+        if description.data_key in coordinator.data
+    )
     async_add_entities(entityArray)
 
 
-class JBLPowerSwitch(SwitchEntity):
+class JBLPowerSwitch(JBLEntity, SwitchEntity):
     """Representation of a switch to control JBL power."""
 
+    _attr_name = "JBL Power"
+    _attr_icon = "mdi:power"
+
     def __init__(self, entry: ConfigEntry, coordinator: Coordinator):
         """Initialize the switch."""
-        self._entry = entry
-        self._is_on = False
-        self.coordinator = coordinator        
+        self.coordinator = coordinator
+        self._attr_unique_id = f"jbl_power_{entry.entry_id}"
+        self._attr_device_info = coordinator.device_info
         self.entity_id = build_entity_id(
             "switch",
-            self.coordinator.device_info.get("name", "jbl_integration"),
+            coordinator.device_info.get("name", "jbl_integration"),
             "power",
         )
 
-    @property
-    def name(self):
-        """Return the name of the switch."""
-        return "JBL Power"
-
-    @property
-    def unique_id(self):
-        """Return a unique ID for the switch."""
-        return f"jbl_power_{self._entry.entry_id}"
-
     @property
     def is_on(self):
         """Return true if switch is on."""
         return self.coordinator.data.get("play_medium") != "UNKNOWN"
 
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend."""
-        return "mdi:power"
-    
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        return self.coordinator.device_info
-
-
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
-        #Toggle Switch Fast
-        #self._is_on = True
-        #self.async_write_ha_state()
-        #Actual update
         await self.coordinator._send_command("power")
-        await self.coordinator.async_request_refresh()
-        #self._is_on =  self.coordinator.data.get("play_medium") != "UNKNOWN"
-        #self.async_write_ha_state()
-
-
+        await self.coordinator.async_refresh_stale()
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
-        #Toggle Switch Fast
-        #self._is_on = False
-        #self.async_write_ha_state()
-        #Actual update
         await self.coordinator._send_command("power")
-        await self.coordinator.async_request_refresh()
-        #self._is_on =  self.coordinator.data.get("play_medium") != "UNKNOWN"
-        #self.async_write_ha_state()
-
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
+        await self.coordinator.async_refresh_stale()
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+        self.async_on_remove(self.coordinator.async_add_key_listener(("play_medium",), self.async_write_ha_state))
 
     async def async_update(self):
         """Update the sensor."""
         await self.coordinator.async_request_refresh()
 
-class NightModeSwitch(SwitchEntity):
-    """Representation of a switch to control JBL NightMode."""
-
-    def __init__(self, entry: ConfigEntry, coordinator: Coordinator):
-        """Initialize the switch."""
-        self._entry = entry
-        self._is_on = False
-        self.coordinator = coordinator        
-        self.entity_id = build_entity_id(
-            "switch",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            "NightMode",
-        )
-
-    @property
-    def name(self):
-        """Return the name of the switch."""
-        return "JBL Night Mode"
-
-    @property
-    def unique_id(self):
-        """Return a unique ID for the switch."""
-        return f"jbl_night_mode_{self._entry.entry_id}"
-
-    @property
-    def is_on(self):
-        """Return true if switch is on."""
-        return self.coordinator.data.get("NightMode") == "on"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend."""
-        return"mdi:waveform"
-    
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        return self.coordinator.device_info
-
-    async def async_turn_on(self, **kwargs):
-        """Turn the switch on."""
-        await self.coordinator.setNightMode(True)
-        
-    async def async_turn_off(self, **kwargs):
-        """Turn the switch off."""
-        await self.coordinator.setNightMode(False)
-
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
-    async def async_added_to_hass(self):
-        """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
 
-    async def async_update(self):
-        """Update the sensor."""
-        await self.coordinator.async_request_refresh()
+class JBLModeSwitch(JBLEntity, SwitchEntity):
+    """Representation of a switch for one JBL sound mode."""
 
-class SmartModeSwitch(SwitchEntity):
-    """Representation of a switch to control JBL SmartMode."""
+    entity_description: JBLModeSwitchEntityDescription
 
-    def __init__(self, entry: ConfigEntry, coordinator: Coordinator):
+    def __init__(self, entry: ConfigEntry, coordinator: Coordinator, description: JBLModeSwitchEntityDescription):
         """Initialize the switch."""
-        self._entry = entry
-        self._is_on = False
-        self.coordinator = coordinator        
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = f"jbl_{description.key}_{entry.entry_id}"
+        self._attr_device_info = coordinator.device_info
         self.entity_id = build_entity_id(
             "switch",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            "smart_mode",
+            coordinator.device_info.get("name", "jbl_integration"),
+            description.entity_suffix,
         )
 
-    @property
-    def name(self):
-        """Return the name of the switch."""
-        return "JBL Smart Mode"
-
-    @property
-    def unique_id(self):
-        """Return a unique ID for the switch."""
-        return f"jbl_smart_mode_{self._entry.entry_id}"
-
     @property
     def is_on(self):
         """Return true if switch is on."""
-        return self.coordinator.data.get("SmartMode") == "on"
-    
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend."""
-        return "mdi:surround-sound"
-    
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        return self.coordinator.device_info
+        return self.coordinator.data.get(self.entity_description.data_key) == "on"
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
-        await self.coordinator._send_command("surround")
-        await self.coordinator.async_request_refresh()
+        self.entity_description.set_fn(self.coordinator, True)
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
-        await self.coordinator._send_command("surround")
-        await self.coordinator.async_request_refresh()
-
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
+        self.entity_description.set_fn(self.coordinator, False)
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+        self.async_on_remove(self.coordinator.async_add_key_listener((self.entity_description.data_key,), self.async_write_ha_state))
 
     async def async_update(self):
         """Update the sensor."""
         await self.coordinator.async_request_refresh()
-
-
-class PureVoiceModeSwitch(SwitchEntity):
-    """Representation of a switch to control JBL PureVoice."""
-
-    def __init__(self, entry: ConfigEntry, coordinator: Coordinator):
-        """Initialize the switch."""
-        self._entry = entry
-        self._is_on = False
-        self.coordinator = coordinator        
-        self.entity_id = build_entity_id(
-            "switch",
-            self.coordinator.device_info.get("name", "jbl_integration"),
-            "pure_voice",
-        )
-
-    @property
-    def name(self):
-        """Return the name of the switch."""
-        return "JBL Pure Voice"
-
-    @property
-    def unique_id(self):
-        """Return a unique ID for the switch."""
-        return f"jbl_pure_voice_{self._entry.entry_id}"
-
-    @property
-    def is_on(self):
-        """Return true if switch is on."""
-        return self.coordinator.data.get("PureVoice") == "on"
-    
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend."""
-        return "mdi:account-voice"
-    
-    @property
-    def device_info(self):
-        """Return device information about this entity."""
-        return self.coordinator.device_info
-
-    async def async_turn_on(self, **kwargs):
-        """Turn the switch on."""
-        await self.coordinator.setPureVoice(True)
-
-    async def async_turn_off(self, **kwargs):
-        """Turn the switch off."""
-        await self.coordinator.setPureVoice(False)
-
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
-    async def async_added_to_hass(self):
-        """When entity is added to hass."""
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
-
-    async def async_update(self):
-        """Update the sensor."""
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""Capture of device traffic to disk, and replay of captured traffic.
+
+A trace is a gzip file of JSON lines, one request per line::
+
+    [offset, method, path, action, body, status, response, duration]
+
+offset is seconds since capture started, path is the URL without scheme and
+host, action the SOAP action (or null) and duration the seconds the device
+took. Failed requests have a null status and "timeout" or "error" as the
+response. Each flush appends a gzip member, which gzip readers concatenate.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .const import TRACE_FLUSH_RECORDS, TRACE_MAX_RECORDS
+
+_LOGGER = logging.getLogger(__name__)
+
+ERROR_TIMEOUT = "timeout"
+ERROR_CLIENT = "error"
+
+
+def _requestKey(method, url, headers, data):
+    parts = urlsplit(url)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    action = (headers or {}).get("Soapaction")
+    if action is not None:
+        action = action.strip('"').rsplit("#", 1)[-1]
+    return method, path, action, data if isinstance(data, str) else None
+
+
+def _commandKey(key):
+    method, path, action, body = key
+    return method, path, action, body.split("&", 1)[0] if body else None
+
+
+class TrafficRecorder:
+    """Collect request/response pairs and append them to a trace file.
+
+    Records are buffered in memory and written off the event loop in batches;
+    capture stops after TRACE_MAX_RECORDS so a forgotten option cannot fill
+    the disk.
+    """
+
+    def __init__(self, path, executor):
+        self.path = path
+        # Runs a blocking callable off the event loop and returns an awaitable.
+        self._executor = executor
+        self._start = time.monotonic()
+        self._buffer = []
+        self._count = 0
+        self._flushing = None
+
+    def record(self, method, url, headers, data, status, text, duration):
+        if self._count >= TRACE_MAX_RECORDS:
+            return
+        self._count += 1
+        method, path, action, body = _requestKey(method, url, headers, data)
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", "replace")
+        self._buffer.append([
+            round(time.monotonic() - self._start - duration, 4),
+            method, path, action, body, status, text, round(duration, 4),
+        ])
+        if self._count == TRACE_MAX_RECORDS:
+            _LOGGER.warning("Traffic capture to %s reached %s requests and stopped", self.path, TRACE_MAX_RECORDS)
+        if len(self._buffer) >= TRACE_FLUSH_RECORDS and self._flushing is None:
+            self._flushing = asyncio.ensure_future(self.async_flush())
+
+    async def async_flush(self):
+        """Append the buffered records to the trace file."""
+        try:
+            while self._buffer:
+                records, self._buffer = self._buffer, []
+                await self._executor(self._write, records)
+        except OSError as e:
+            _LOGGER.error("Error writing traffic capture %s: %s", self.path, str(e))
+        finally:
+            self._flushing = None
+
+    async def async_close(self):
+        if self._flushing is not None:
+            await self._flushing
+        await self.async_flush()
+
+    def _write(self, records):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.write(lines)
+
+
+def load_trace(path):
+    """Return the records of a trace file."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class ReplayTransport:
+    """Answer coordinator requests from a captured trace.
+
+    Responses to the same request are handed out in captured order, and the
+    last one repeats once they run out. Each answer takes its captured
+    duration divided by speed; a speed of 0 answers immediately.
+    """
+
+    def __init__(self, records, speed=1.0):
+        self.speed = speed
+        self.misses = 0
+        self._responses = defaultdict(deque)
+        # Request without its payload -> responses, for writes whose values
+        # differ from the captured ones.
+        self._byCommand = {}
+        for _, method, path, action, body, status, text, duration in records:
+            key = (method, path, action, body)
+            self._responses[key].append((status, text, duration))
+            self._byCommand.setdefault(_commandKey(key), self._responses[key])
+
+    @classmethod
+    def fromFile(cls, path, speed=1.0):
+        return cls(load_trace(path), speed)
+
+    async def request(self, method, url, headers=None, data=None, **kwargs):
+        """Return the status and body text captured for this request."""
+        key = _requestKey(method, url, headers, data)
+        responses = self._responses.get(key) or self._byCommand.get(_commandKey(key))
+        if not responses:
+            self.misses += 1
+            return 404, ""
+        status, text, duration = responses.popleft() if len(responses) > 1 else responses[0]
+        if self.speed:
+            await asyncio.sleep(duration / self.speed)
+        if status is None:
+            if text == ERROR_TIMEOUT:
+                raise TimeoutError
+            raise aiohttp.ClientError(text)
+        return status, text
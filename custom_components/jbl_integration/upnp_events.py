@@ -0,0 +1,158 @@
+"""UPnP GENA event subscriptions for JBL soundbars."""
+import asyncio
+import logging
+from xml.etree import ElementTree as ET
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+# Event sub-URLs of the AVTransport and RenderingControl services.
+SERVICES = ("rendertransport1", "rendercontrol1")
+SUBSCRIPTION_TIMEOUT = 1800
+RESUBSCRIBE_DELAY = 300
+
+# LastChange state variable -> coordinator data key.
+LAST_CHANGE_KEYS = {
+    "TransportState": "transport_state",
+    "TransportStatus": "transport_status",
+    "CurrentTrackURI": "track",
+    "CurrentTrackDuration": "track_duration",
+    "Volume": "volume_level",
+    "Mute": "mute",
+}
+
+
+def _localName(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_last_change(body):
+    """Return coordinator data updates from a GENA NOTIFY body."""
+    updates = {}
+    for prop in ET.fromstring(body):
+        for variable in prop:
+            if _localName(variable.tag) != "LastChange" or not variable.text:
+                continue
+            for instance in ET.fromstring(variable.text):
+                for change in instance:
+                    key = LAST_CHANGE_KEYS.get(_localName(change.tag))
+                    if key is None or change.get("channel") not in (None, "Master"):
+                        continue
+                    updates[key] = change.get("val")
+    return updates
+
+
+class UpnpEventSubscriber:
+    """Keep GENA subscriptions alive and feed NOTIFY updates to a callback.
+
+    onEvent receives a dict of coordinator data updates; onStatus receives
+    True once every service is subscribed and False when subscribing fails.
+    """
+
+    def __init__(self, session, eventUrl, callbackHost, onEvent, onStatus, callbackPort=0):
+        self._session = session
+        self._eventUrl = eventUrl
+        self._callbackHost = callbackHost
+        self._callbackPort = callbackPort
+        self._onEvent = onEvent
+        self._onStatus = onStatus
+        self._sids = {}
+        self._runner = None
+        self._task = None
+        self.callbackUrl = None
+
+    @property
+    def subscribed(self):
+        return len(self._sids) == len(SERVICES)
+
+    async def async_start(self):
+        """Start the callback listener and the subscription keeper."""
+        app = web.Application()
+        app.router.add_route("NOTIFY", "/{service}", self._handleNotify)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._callbackHost, self._callbackPort)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.callbackUrl = f"http://{self._callbackHost}:{port}"
+        self._task = asyncio.create_task(self._maintain())
+
+    async def async_stop(self):
+        """Cancel subscriptions and stop the listener."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for service, sid in list(self._sids.items()):
+            try:
+                async with asyncio.timeout(5):
+                    async with self._session.request("UNSUBSCRIBE", f"{self._eventUrl}/{service}", headers={"SID": sid}):
+                        pass
+            except Exception as e:
+                _LOGGER.debug("Error unsubscribing from %s: %s", service, str(e))
+        self._sids.clear()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _maintain(self):
+        while True:
+            try:
+                timeout = await self._subscribeAll()
+            except Exception as e:
+                _LOGGER.warning("UPnP event subscription failed, falling back to polling: %s", str(e))
+                self._sids.clear()
+                self._onStatus(False)
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
+                continue
+            self._onStatus(True)
+            await asyncio.sleep(max(30, timeout // 2))
+
+    async def _subscribeAll(self):
+        """Subscribe to or renew every service and return the shortest timeout."""
+        return min([await self._subscribe(service) for service in SERVICES])
+
+    async def _subscribe(self, service):
+        url = f"{self._eventUrl}/{service}"
+        sid = self._sids.get(service)
+        if sid is not None:
+            headers = {"SID": sid, "TIMEOUT": f"Second-{SUBSCRIPTION_TIMEOUT}"}
+            async with asyncio.timeout(10):
+                async with self._session.request("SUBSCRIBE", url, headers=headers) as response:
+                    if response.status == 200:
+                        return self._parseTimeout(response.headers.get("TIMEOUT"))
+            # Renewal rejected, e.g. after a device reboot: subscribe afresh.
+            self._sids.pop(service, None)
+
+        headers = {
+            "CALLBACK": f"<{self.callbackUrl}/{service}>",
+            "NT": "upnp:event",
+            "TIMEOUT": f"Second-{SUBSCRIPTION_TIMEOUT}",
+        }
+        async with asyncio.timeout(10):
+            async with self._session.request("SUBSCRIBE", url, headers=headers) as response:
+                if response.status != 200 or "SID" not in response.headers:
+                    raise ConnectionError(f"SUBSCRIBE {service} returned {response.status}")
+                self._sids[service] = response.headers["SID"]
+                return self._parseTimeout(response.headers.get("TIMEOUT"))
+
+    @staticmethod
+    def _parseTimeout(value):
+        try:
+            return int(value.lower().removeprefix("second-"))
+        except (AttributeError, ValueError):
+            return SUBSCRIPTION_TIMEOUT
+
+    async def _handleNotify(self, request):
+        if request.headers.get("SID") not in self._sids.values():
+            return web.Response(status=412)
+        body = await request.text()
+        try:
+            updates = parse_last_change(body)
+        except ET.ParseError as e:
+            _LOGGER.debug("Could not parse UPnP event: %s", str(e))
+            return web.Response(status=200)
+        _LOGGER.debug("UPnP event from %s: %s", request.match_info["service"], updates)
+        if updates:
+            self._onEvent(updates)
+        return web.Response(status=200)
@@ -0,0 +1,16 @@
+"""Helpers shared by the tests."""
+from benchmarks.standalone import coordinator_for
+
+
+async def started_coordinator(device, options=None):
+    """Return a coordinator for the fake device, set up and polled once."""
+    coordinator = coordinator_for(device.host, device.http_port, device.upnp_port, entryId="test", options=options)
+    await coordinator._SetupDeviceInfo()
+    coordinator.data = await coordinator._async_update_data()
+    return coordinator
+
+
+async def poll(coordinator):
+    """Run a full poll cycle, reading every endpoint."""
+    coordinator.invalidate(*coordinator.pollPlan)
+    coordinator.data = await coordinator._async_update_data()
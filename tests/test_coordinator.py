@@ -0,0 +1,126 @@
+"""Tests of the coordinator's polling against the fake soundbar."""
+import asyncio
+from datetime import timedelta
+import time
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+import pytest
+
+from benchmarks.fake_soundbar import FakeSoundbar
+from custom_components.jbl_integration.const import BOOST_SCAN_INTERVAL, BREAKER_FAILURE_THRESHOLD, IDLE_GRACE_PERIOD
+from custom_components.jbl_integration.coordinator import HEALTH_CLOSED, HEALTH_OPEN
+
+from .common import poll, started_coordinator
+
+
+def test_read_started_before_a_command_does_not_clear_it():
+    async def run():
+        device = FakeSoundbar()
+        await device.start()
+        coordinator = await started_coordinator(device, {"adaptive_polling": False})
+        try:
+            coordinator.invalidate(*coordinator.pollPlan)
+            device.latency = 0.2
+            cycle = asyncio.ensure_future(coordinator._async_update_data())
+            # The cycle's reads are out; the device answers them before the
+            # write arrives.
+            await asyncio.sleep(0.1)
+            write = asyncio.ensure_future(coordinator.setNightMode(True))
+            coordinator.data = await cycle
+            assert coordinator.data["NightMode"] == "off"
+            assert "night_mode" in coordinator._staleEndpoints
+            assert "night_mode" in coordinator._dueEndpoints(time.monotonic())
+            assert await write
+
+            # The next regular cycle reads night mode again.
+            device.latency = 0.0
+            coordinator.data = await coordinator._async_update_data()
+            assert coordinator.data["NightMode"] == "on"
+            assert "night_mode" not in coordinator._staleEndpoints
+        finally:
+            await coordinator.async_close()
+            await device.stop()
+
+    asyncio.run(run())
+
+
+def test_stopped_soundbar_is_polled_slowly_after_grace_period():
+    async def run():
+        device = FakeSoundbar()
+        await device.start()
+        coordinator = await started_coordinator(device)
+        try:
+            device.state["transport_state"] = "STOPPED"
+            await poll(coordinator)
+            # Stopping is activity; the grace period keeps the full poll plan.
+            coordinator._boostUntil = 0.0
+            coordinator.invalidate(*coordinator.pollPlan)
+            assert coordinator._dueEndpoints(time.monotonic()) == list(coordinator.pollPlan)
+
+            coordinator._idleSince -= IDLE_GRACE_PERIOD
+            assert coordinator._dueEndpoints(time.monotonic()) == ["info"]
+            coordinator.data = await coordinator._async_update_data()
+            assert coordinator.update_interval == timedelta(seconds=coordinator.idleInterval)
+
+            # Playing again boosts back to the full plan.
+            device.state["transport_state"] = "PLAYING"
+            coordinator.data = await coordinator._async_update_data()
+            assert coordinator._idleSince is None
+            assert coordinator.update_interval == timedelta(seconds=BOOST_SCAN_INTERVAL)
+            assert coordinator._dueEndpoints(time.monotonic()) == list(coordinator.pollPlan)
+        finally:
+            await coordinator.async_close()
+            await device.stop()
+
+    asyncio.run(run())
+
+
+def test_probe_marks_missing_upnp_action_unsupported():
+    async def run():
+        for unsupported, expected in (((), True), (("GetVolume",), False)):
+            device = FakeSoundbar(unsupported_actions=unsupported)
+            await device.start()
+            coordinator = await started_coordinator(device)
+            try:
+                assert coordinator.capabilities["volume"] is expected
+            finally:
+                await coordinator.async_close()
+                await device.stop()
+
+    asyncio.run(run())
+
+
+def test_circuit_breaker_opens_backs_off_and_recovers():
+    async def run():
+        device = FakeSoundbar()
+        await device.start()
+        coordinator = await started_coordinator(device, {"adaptive_polling": False, "read_retries": 0})
+        try:
+            device.error_rate = 1.0
+            for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+                await poll(coordinator)
+                assert coordinator.health == HEALTH_CLOSED
+            with pytest.raises(UpdateFailed):
+                await poll(coordinator)
+            assert coordinator.health == HEALTH_OPEN
+            assert coordinator.update_interval == timedelta(seconds=10)
+
+            # While open, each cycle only probes transport info and backs off further.
+            device.requests.clear()
+            with pytest.raises(UpdateFailed):
+                await poll(coordinator)
+            assert list(device.requests) == ["GetInfoEx"]
+            assert coordinator.update_interval == timedelta(seconds=20)
+
+            device.error_rate = 0.0
+            device.state["night_mode"] = "on"
+            coordinator.data = await coordinator._async_update_data()
+            assert coordinator.health == HEALTH_CLOSED
+            assert coordinator.update_interval == timedelta(seconds=5)
+            # Recovery re-reads the whole poll plan.
+            assert coordinator.data["NightMode"] == "on"
+        finally:
+            await coordinator.async_close()
+            await device.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+"""Tests of request retries under the request policy."""
+import asyncio
+
+import aiohttp
+import pytest
+
+from benchmarks.standalone import coordinator_for
+from custom_components.jbl_integration.request_policy import RequestPolicy
+
+
+class ScriptedTransport:
+    """Answer requests with the given results in order; exceptions are raised."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def request(self, method, url, **kwargs):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _request(transport, idempotent, retries=2):
+    coordinator = coordinator_for("policy.invalid", options={"read_retries": retries})
+    coordinator.transport = transport
+    coordinator.requestPolicy.retryDelay = lambda attempt: 0
+    return coordinator._request("GET", "http://policy.invalid/httpapi.asp?command=getSmartMode", idempotent=idempotent)
+
+
+def test_attempts_follow_idempotency():
+    policy = RequestPolicy(retries=2)
+    assert policy.attempts(True) == 3
+    assert policy.attempts(False) == 1
+
+
+def test_reads_are_retried_on_5xx_and_transport_errors():
+    transport = ScriptedTransport((503, ""), aiohttp.ClientError("reset"), (200, "ok"))
+    assert asyncio.run(_request(transport, idempotent=True)) == (200, "ok")
+    assert transport.calls == 3
+
+
+def test_reads_give_up_after_the_last_attempt():
+    transport = ScriptedTransport((503, "busy"), (503, "busy"), (503, "busy"))
+    assert asyncio.run(_request(transport, idempotent=True)) == (503, "busy")
+    transport = ScriptedTransport(TimeoutError(), TimeoutError(), TimeoutError())
+    with pytest.raises(TimeoutError):
+        asyncio.run(_request(transport, idempotent=True))
+    assert transport.calls == 3
+
+
+def test_other_answers_are_not_retried():
+    transport = ScriptedTransport((404, ""))
+    assert asyncio.run(_request(transport, idempotent=True)) == (404, "")
+    assert transport.calls == 1
+
+
+def test_writes_are_sent_once():
+    transport = ScriptedTransport((503, ""))
+    assert asyncio.run(_request(transport, idempotent=False)) == (503, "")
+    assert transport.calls == 1
+    transport = ScriptedTransport(aiohttp.ClientError("reset"))
+    with pytest.raises(aiohttp.ClientError):
+        asyncio.run(_request(transport, idempotent=False))
+    assert transport.calls == 1
@@ -0,0 +1,46 @@
+"""Tests of the UPnP SOAP response decoders."""
+from benchmarks.fake_soundbar import CONTROL_DEVICE_INFO_RESPONSE, INFO_EX_RESPONSE, INVALID_ACTION_RESPONSE, VOLUME_RESPONSE
+from custom_components.jbl_integration.soap import has_element, is_unsupported_action, parse_control_device_info, parse_info_ex
+
+
+def test_parse_info_ex_maps_every_field():
+    text = INFO_EX_RESPONSE.format(transport_state="PLAYING", play_medium="HDMI", track="tv", volume=30, mute=0)
+    assert parse_info_ex(text) == {
+        "play_medium": "HDMI",
+        "volume_level": "30",
+        "track": "tv",
+        "transport_state": "PLAYING",
+        "transport_status": "OK",
+        "track_duration": "00:00:00",
+        "mute": "0",
+        "channel": "0",
+        "slaves": "0",
+    }
+
+
+def test_parse_info_ex_keeps_fields_when_one_is_missing():
+    text = INFO_EX_RESPONSE.format(transport_state="STOPPED", play_medium="UNKNOWN", track="", volume=5, mute=1)
+    text = text.replace("<CurrentVolume>5</CurrentVolume>", "")
+    values = parse_info_ex(text)
+    assert "volume_level" not in values
+    assert values["play_medium"] == "UNKNOWN"
+    assert values["mute"] == "1"
+
+
+def test_parse_info_ex_rejects_malformed_xml():
+    assert parse_info_ex("<s:Envelope><unclosed>") == {}
+
+
+def test_parse_control_device_info_decodes_the_status_json():
+    text = CONTROL_DEVICE_INFO_RESPONSE.format(volume=30, mute=0, status='{"hm_product_name": "JBL Bar &amp; Co"}')
+    assert parse_control_device_info(text) == {"hm_product_name": "JBL Bar & Co"}
+    assert parse_control_device_info(CONTROL_DEVICE_INFO_RESPONSE.format(volume=30, mute=0, status="not json")) == {}
+    assert parse_control_device_info(CONTROL_DEVICE_INFO_RESPONSE.format(volume=30, mute=0, status="")) == {}
+
+
+def test_unsupported_action_fault_and_response_elements():
+    assert is_unsupported_action(INVALID_ACTION_RESPONSE)
+    assert not is_unsupported_action(INVALID_ACTION_RESPONSE.replace("401", "501"))
+    assert not is_unsupported_action("")
+    assert has_element(VOLUME_RESPONSE.format(volume=30), "CurrentVolume")
+    assert not has_element(VOLUME_RESPONSE.format(volume=30), "CurrentMute")
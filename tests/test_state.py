@@ -0,0 +1,43 @@
+"""Tests of the soundbar state and its change diffing."""
+import pytest
+
+from custom_components.jbl_integration.state import EQPreset, SoundbarState, intern_preset
+
+
+def test_merged_returns_a_new_state_and_keeps_the_old_one():
+    state = SoundbarState({"volume_level": "30", "mute": "0"})
+    merged = state.merged({"volume_level": "40"}, {"mute": "1"})
+    assert dict(state) == {"volume_level": "30", "mute": "0"}
+    assert dict(merged) == {"volume_level": "40", "mute": "1"}
+
+
+def test_later_updates_win_and_unknown_keys_are_dropped():
+    state = SoundbarState().merged({"NightMode": "off", "unknown": 1}, {"NightMode": "on"})
+    assert dict(state) == {"NightMode": "on"}
+    assert "unknown" not in state
+    with pytest.raises(KeyError):
+        state["unknown"]
+
+
+def test_changed_keys_lists_only_differing_values():
+    state = SoundbarState({"volume_level": "30", "NightMode": "off", "125Hz": 0.0})
+    changed = state.merged({"volume_level": "31", "NightMode": "off", "SmartMode": "on"})
+    assert sorted(changed.changedKeys(state)) == ["SmartMode", "volume_level"]
+    assert state.merged().changedKeys(state) == []
+
+
+def test_state_is_read_only():
+    state = SoundbarState({"mute": "0"})
+    with pytest.raises(AttributeError):
+        state.mute = "1"
+
+
+def test_presets_are_interned_and_serialised_as_dicts():
+    item = {"eq_id": "1", "eq_name": "Music", "band": 7, "eq_payload": {"gain": [1.0, 2.0]}}
+    first = SoundbarState({"eq_preset_data": {"1": item}})
+    second = SoundbarState({"eq_preset_data": {"1": dict(item)}})
+    assert isinstance(first["eq_preset_data"]["1"], EQPreset)
+    assert first["eq_preset_data"]["1"] is second["eq_preset_data"]["1"]
+    assert first.changedKeys(second) == []
+    assert first.asDict()["eq_preset_data"] == {"1": {"band": 7, "eq_payload": {"gain": [1.0, 2.0]}}}
+    assert intern_preset(first.asDict()["eq_preset_data"]["1"]) is first["eq_preset_data"]["1"]
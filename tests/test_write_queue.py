@@ -0,0 +1,66 @@
+"""Tests of the coordinator's queued writes against the fake soundbar.
+
+Run from the repository root::
+
+    python -m pytest tests
+"""
+import asyncio
+
+from benchmarks.fake_soundbar import FakeSoundbar
+
+from .common import poll, started_coordinator
+
+
+def test_eq_bands_moved_together_all_settle():
+    async def run():
+        device = FakeSoundbar()
+        await device.start()
+        coordinator = await started_coordinator(device)
+        try:
+            coordinator.queueEQ(3.0, "125Hz")
+            await coordinator.queueEQ(2.0, "250Hz")
+            assert device.state["gains"][:2] == [3.0, 2.0]
+            assert not coordinator._optimistic
+
+            # Both bands follow the device again after the write.
+            device.state["gains"] = [-1.0, -2.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+            await poll(coordinator)
+            assert coordinator.data["125Hz"] == -1.0
+            assert coordinator.data["250Hz"] == -2.0
+        finally:
+            await coordinator.async_close()
+            await device.stop()
+
+    asyncio.run(run())
+
+
+def test_smart_mode_toggle_in_flight_is_not_pressed_twice():
+    async def run():
+        device = FakeSoundbar()
+        await device.start()
+        coordinator = await started_coordinator(device)
+        try:
+            assert device.state["smart_mode"] == "on"
+            device.latency = 0.3
+            first = coordinator.queueSmartMode(False)
+            # Past the settle window: the first key press is on its way.
+            await asyncio.sleep(0.4)
+            second = coordinator.queueSmartMode(False)
+            await asyncio.gather(first, second)
+            assert device.requests["sendAppController"] == 1
+            assert device.state["smart_mode"] == "off"
+
+            # A toggle back while a press is in flight is sent after it.
+            first = coordinator.queueSmartMode(True)
+            await asyncio.sleep(0.4)
+            second = coordinator.queueSmartMode(False)
+            third = coordinator.queueSmartMode(True)
+            await asyncio.gather(first, third)
+            assert second.cancelled()
+            assert device.state["smart_mode"] == "on"
+            assert coordinator.data["SmartMode"] == "on"
+        finally:
+            await coordinator.async_close()
+            await device.stop()
+
+    asyncio.run(run())